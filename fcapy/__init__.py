@@ -20,5 +20,7 @@ PACKAGE_DESCRIPTION = {
     'bitsets': "The package greatly optimizes BinTables execution",
     'bitarray': "The package greatly optimizes BinTables execution",
     'networkx': "The package to convert POSets to Graphs and to visualize them as graphs",
+    'numba': "The package compiles the loops of CbO algorithm to speed up concepts construction",
+    'orjson': "The package speeds up reading concepts and lattices from .json format",
 }
 LIB_INSTALLED = check_installed_packages(PACKAGE_DESCRIPTION)
@@ -7,6 +7,9 @@ Modules:
     This module contains a number of functions which take a `FormalContext` (or `MVContext`)
     and return a set of formal (or pattern) concepts.
     Some of them return a `ConceptLattice` instead of just a set of concepts
+  cbo_numba:
+    This module contains a Numba-compiled kernel of CloseByOne algorithm
+    which is used by `concept_construction.close_by_one` function to process `FormalContext` faster
   lattice_construction:
     This module contains a number of function which take a set of formal (or pattern) concepts
     and return its children_dict
@@ -0,0 +1,231 @@
+"""
+This module contains a Numba-compiled kernel of CloseByOne (CbO) algorithm for `FormalContext`.
+
+The kernel works with sets of objects and attributes packed into bitsets: rows of `numpy.uint64` words
+where the i-th bit of the row is set iff the i-th element belongs to the set.
+Use `close_by_one` function from `fcapy.algorithms.concept_construction` module to run the kernel.
+
+"""
+from typing import List, Collection, Tuple
+
+import numpy as np
+from numba import njit, types
+from numba.typed import Dict
+
+WORD_SIZE = 64
+
+
+def pack_bitsets(flags: Collection[Collection[bool]], n_bits: int) -> np.ndarray:
+    """Pack each row of boolean ``flags`` of length ``n_bits`` into a row of `numpy.uint64` words"""
+    n_words = max(1, -(-n_bits // WORD_SIZE))
+    flags = np.asarray(flags, dtype=bool).reshape(len(flags), n_bits)
+
+    packed = np.zeros((len(flags), n_words * 8), dtype=np.uint8)
+    packed[:, :-(-n_bits // 8)] = np.packbits(flags, axis=1, bitorder='little')
+    return packed.view('<u8').astype(np.uint64)
+
+
+def unpack_bitsets(bitsets: np.ndarray, n_bits: int) -> List[List[int]]:
+    """Return the sorted list of indexes of set bits for each row of ``bitsets`` (the inverse of `pack_bitsets`)"""
+    flags = np.unpackbits(bitsets.astype('<u8').view(np.uint8), axis=1, count=n_bits, bitorder='little')
+    if len(flags) == 0:
+        return []
+
+    # Indexes of all rows are found at once as a single int array and then split by rows
+    indexes = flags.nonzero()[1]
+    return [row_indexes.tolist() for row_indexes in np.split(indexes, flags.sum(axis=1).cumsum()[:-1])]
+
+
+@njit(cache=True, boundscheck=False)
+def _intersect_rows(rows, selected, full):
+    """Return the bitwise AND of ``full`` and the ``rows`` whose indexes are set in ``selected`` bitset"""
+    result = full.copy()
+    one = np.uint64(1)
+    for w in range(selected.shape[0]):
+        word = selected[w]
+        while word:
+            lowest_bit = word & (~word + one)
+            b = 0
+            while (lowest_bit >> np.uint64(b)) != one:
+                b += 1
+            row = rows[w * WORD_SIZE + b]
+            for v in range(result.shape[0]):
+                result[v] &= row[v]
+            word ^= lowest_bit
+    return result
+
+
+@njit(cache=True)
+def _grow(array, size):
+    """Return a copy of ``array`` with the first dimension extended to ``size``"""
+    new_array = np.zeros((size,) + array.shape[1:], dtype=array.dtype)
+    new_array[:array.shape[0]] = array
+    return new_array
+
+
+@njit(cache=True, boundscheck=False)
+def _is_equal(bitset_a, bitset_b):
+    for w in range(bitset_a.shape[0]):
+        if bitset_a[w] != bitset_b[w]:
+            return False
+    return True
+
+
+@njit(cache=True)
+def _hash_bitset(bitset):
+    h = np.uint64(14695981039346656037)
+    for w in range(bitset.shape[0]):
+        h = (h ^ bitset[w]) * np.uint64(1099511628211)
+    return np.int64(h >> np.uint64(1))
+
+
+@njit(cache=True, boundscheck=False)
+def close_by_one_bitsets(
+        iter_to_side: np.ndarray, side_to_iter: np.ndarray,
+        full_sideset: np.ndarray, full_iterset: np.ndarray,
+        iter_elements: np.ndarray, initial_combinations: np.ndarray, initial_lasts: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Run CbO algorithm over the bitsets and return the closed itersets and their sidesets
+
+    Parameters
+    ----------
+    iter_to_side: `numpy.ndarray` of `numpy.uint64` of shape (n_iters, n_side_words)
+        The bitset of sideset elements related to each iterset element (e.g. attributes of each object)
+    side_to_iter: `numpy.ndarray` of `numpy.uint64` of shape (n_sides, n_iter_words)
+        The bitset of iterset elements related to each sideset element (e.g. objects of each attribute)
+    full_sideset: `numpy.ndarray` of `numpy.uint64` of shape (n_side_words,)
+        The bitset of all sideset elements
+    full_iterset: `numpy.ndarray` of `numpy.uint64` of shape (n_iter_words,)
+        The bitset of all iterset elements
+    iter_elements: `numpy.ndarray` of `numpy.int64`
+        Iterset elements to run CbO algorithm on
+    initial_combinations: `numpy.ndarray` of `numpy.uint64` of shape (n_combinations, n_iter_words)
+        Bitsets of combinations to start CbO algorithm from
+    initial_lasts: `numpy.ndarray` of `numpy.int64` of shape (n_combinations,)
+        The last element added to each initial combination (or -1 for empty combinations)
+
+    Returns
+    -------
+    itersets: `numpy.ndarray` of `numpy.uint64` of shape (n_concepts, n_iter_words)
+        Bitsets of closed itersets in the order of their generation
+    sidesets: `numpy.ndarray` of `numpy.uint64` of shape (n_concepts, n_side_words)
+        Bitsets of sidesets corresponding to ``itersets``
+
+    """
+    n_iter_words, n_side_words = full_iterset.shape[0], full_sideset.shape[0]
+    one = np.uint64(1)
+
+    # The combinations are kept in a stack (the next combination to check is the last one)
+    n_stack = initial_combinations.shape[0]
+    stack_combs = _grow(np.ascontiguousarray(initial_combinations[::-1]), max(n_stack, 16))
+    stack_lasts = _grow(np.ascontiguousarray(initial_lasts[::-1]), max(n_stack, 16))
+
+    n_found = 0
+    itersets = np.zeros((16, n_iter_words), dtype=np.uint64)
+    sidesets = np.zeros((16, n_side_words), dtype=np.uint64)
+    # Itersets with the same hash value are chained through ``next_same_hash`` array
+    hash_heads = Dict.empty(key_type=types.int64, value_type=types.int64)
+    next_same_hash = np.full(16, -1, dtype=np.int64)
+
+    while n_stack > 0:
+        n_stack -= 1
+        comb, comb_last = stack_combs[n_stack].copy(), stack_lasts[n_stack]
+        sideset = _intersect_rows(iter_to_side, comb, full_sideset)
+        iterset = _intersect_rows(side_to_iter, sideset, full_iterset)
+
+        # The closure should not add any element smaller than the last element of the combination
+        is_not_lexicographic = False
+        last_w = comb_last // WORD_SIZE
+        for w in range(last_w + 1 if comb_last > 0 else 0):
+            new_elements = iterset[w] & ~comb[w]
+            if w == last_w:
+                new_elements &= (one << np.uint64(comb_last % WORD_SIZE)) - one
+            if new_elements:
+                is_not_lexicographic = True
+                break
+        if is_not_lexicographic:
+            continue
+
+        h = _hash_bitset(iterset)
+        found_i = hash_heads[h] if h in hash_heads else -1
+        while found_i >= 0 and not _is_equal(itersets[found_i], iterset):
+            found_i = next_same_hash[found_i]
+        if found_i >= 0:  # i.e. iterset is a duplicate
+            continue
+
+        if n_found == itersets.shape[0]:
+            itersets, sidesets = _grow(itersets, 2 * n_found), _grow(sidesets, 2 * n_found)
+            next_same_hash = np.concatenate((next_same_hash, np.full(n_found, -1, dtype=np.int64)))
+        itersets[n_found], sidesets[n_found] = iterset, sideset
+        next_same_hash[n_found] = hash_heads[h] if h in hash_heads else -1
+        hash_heads[h] = n_found
+        n_found += 1
+
+        # Push the new combinations in descending order so that the smallest new element is explored first
+        for j in range(iter_elements.shape[0] - 1, -1, -1):
+            g_i = iter_elements[j]
+            w, bit = g_i // WORD_SIZE, one << np.uint64(g_i % WORD_SIZE)
+            if g_i <= comb_last or iterset[w] & bit:
+                continue
+
+            if n_stack == stack_combs.shape[0]:
+                stack_combs, stack_lasts = _grow(stack_combs, 2 * n_stack), _grow(stack_lasts, 2 * n_stack)
+            for v in range(n_iter_words):
+                stack_combs[n_stack, v] = iterset[v]
+            stack_combs[n_stack, w] |= bit
+            stack_lasts[n_stack] = g_i
+            n_stack += 1
+
+    return itersets[:n_found], sidesets[:n_found]
+
+
+def close_by_one_flags(
+        flags: Collection[Collection[bool]], n_columns: int,
+        iter_elements: Collection[int],
+        initial_combinations: List[List[int]] = None,
+        iterate_rows: bool = True
+) -> Tuple[List[Tuple[int, ...]], List[List[int]]]:
+    """Run CbO algorithm over the binary table ``flags`` and return closed itersets and their sidesets
+
+    Parameters
+    ----------
+    flags: `list` of `list` of `bool`
+        The binary table to run CbO on (e.g. the data of `FormalContext`)
+    n_columns: `int`
+        The number of columns in the table ``flags``
+    iter_elements: `list` of `int`
+        Iterset elements to run CbO algorithm on
+    initial_combinations: `list` of `list` of `int`
+        A list of subsets of iterset elements to start CbO algorithm from. Default value is [[]]
+    iterate_rows: `bool`
+        A flag whether to iterate over the rows of ``flags`` (if set True) or over the columns (if set False)
+
+    Returns
+    -------
+    itersets_i: `list` of `tuple` of `int`
+        Indexes of closed itersets
+    sidesets_i: `list` of `list` of `int`
+        Indexes of sidesets corresponding to ``itersets_i``
+
+    """
+    iter_to_side_flags = np.asarray(flags, dtype=bool).reshape(len(flags), n_columns)
+    if not iterate_rows:
+        iter_to_side_flags = iter_to_side_flags.T
+    n_iters, n_sides = iter_to_side_flags.shape
+    initial_combinations = [[]] if initial_combinations is None else initial_combinations
+
+    combinations_flags = np.zeros((len(initial_combinations), n_iters), dtype=bool)
+    for comb_i, comb in enumerate(initial_combinations):
+        combinations_flags[comb_i, list(comb)] = True
+    combinations_lasts = np.array([comb[-1] if len(comb) > 0 else -1 for comb in initial_combinations], dtype=np.int64)
+
+    itersets, sidesets = close_by_one_bitsets(
+        pack_bitsets(iter_to_side_flags, n_sides), pack_bitsets(iter_to_side_flags.T, n_iters),
+        pack_bitsets(np.ones((1, n_sides), dtype=bool), n_sides)[0],
+        pack_bitsets(np.ones((1, n_iters), dtype=bool), n_iters)[0],
+        np.array(iter_elements, dtype=np.int64).reshape(-1),
+        pack_bitsets(combinations_flags, n_iters), combinations_lasts
+    )
+    itersets_i = [tuple(iterset_i) for iterset_i in unpack_bitsets(itersets, n_iters)]
+    sidesets_i = unpack_bitsets(sidesets, n_sides)
+    return itersets_i, sidesets_i
@@ -4,20 +4,28 @@ and return a set of formal (or pattern) concepts.
 Some of them return a `ConceptLattice` instead of just a set of concepts.
 
 """
-from typing import List, Tuple
+from typing import List, Tuple, Collection, Iterator
 
 from fcapy.context.formal_context import FormalContext
 from fcapy.mvcontext.mvcontext import MVContext
 from fcapy.lattice.formal_concept import FormalConcept
 from fcapy.lattice.pattern_concept import PatternConcept
 from fcapy.utils import utils
+from fcapy import LIB_INSTALLED
+import dataclasses
 import random
-from copy import deepcopy, copy
 import math
+import warnings
+
+if LIB_INSTALLED['numpy']:
+    import numpy as np
+
+if LIB_INSTALLED['numba']:
+    from fcapy.algorithms import cbo_numba
 
 
 def close_by_one(context: MVContext, output_as_concepts=True, iterate_extents=None,
-                 initial_combinations=None, iter_concepts_to_check=None):
+                 initial_combinations=None, iter_concepts_to_check=None, closure_cache=None):
     """Return a list of concepts generated by CloseByOne (CbO) algorithm
 
     Parameters
@@ -32,9 +40,16 @@ def close_by_one(context: MVContext, output_as_concepts=True, iterate_extents=No
         By default it sets to True if the set of objects is smaller than the set of attributes
     initial_combinations: `list` of `int`
         A list of subsets of objects/attributes indexes (depends on ``iterate_extents``) to start CbO algorithm from
-        Default value is empty list []
+        Default value is empty list []. The list is only read (never modified), so there is no need to copy it
     iter_concepts_to_check: `list` of `int`
         A list of attributes/objects indexes (depends on ``iterate_extents``) to run CbO algorithm on
+    closure_cache: `dict`
+        A dictionary to memoize Galois closures between the calls of the function. Is updated inplace.
+        Maps a bitset of a combination of objects/attributes (depends on ``iterate_extents``) to the pair
+        (<sideset of the combination>, <bitset of the closed combination>).
+        The sideset is encoded as a bitset if the ``context`` is a `FormalContext`.
+        The cache is only valid for the ``context`` (and ``iterate_extents`` value) it has been filled on.
+        The compiled (numba) version of CbO is only run when no cache is given
 
     Returns
     -------
@@ -72,63 +87,144 @@ def close_by_one(context: MVContext, output_as_concepts=True, iterate_extents=No
         iterset_fnc, sideset_fnc = sideset_fnc, iterset_fnc
 
     iter_concepts_to_check = list(range(n_iters)) if iter_concepts_to_check is None else iter_concepts_to_check
+    is_formal_context = type(context) == FormalContext
 
-    itersets_i_dict = {}
-    sidesets_i = []
-    combinations_to_check = [[]] if initial_combinations is None else initial_combinations
+    if is_formal_context and LIB_INSTALLED['numba'] and closure_cache is None:
+        # Run the compiled version of the loop below over the binary data packed into numpy.uint64 words
+        itersets_i, sidesets_i = cbo_numba.close_by_one_flags(
+            context.data.to_list(), context.n_attributes, iter_concepts_to_check, initial_combinations,
+            iterate_rows=iterate_extents)
+    else:
+        # Subsets of <iterset> are encoded as bitsets:
+        #   python integers whose i-th bit is set iff i-th element is in a subset
+        if is_formal_context:
+            # Galois closures are computed as bitwise AND of the rows (or columns) of the context.
+            # Thus, <sideset> is encoded as a bitset as well
+            iter_axis = 1 if iterate_extents else 0  # i.e. <iterset> elements are the rows (or columns) of the data
+            iter_to_side_bits = context.data.to_bitsets(axis=iter_axis)
+            side_to_iter_bits = context.data.to_bitsets(axis=1 - iter_axis)
+            full_sideset_bits = (1 << len(side_to_iter_bits)) - 1
+            full_iterset_bits = (1 << n_iters) - 1
+
+            def sideset_bits_fnc(comb_bits):
+                sideset_bits = full_sideset_bits
+                for x_i in utils.bitset_to_indexes(comb_bits):
+                    sideset_bits &= iter_to_side_bits[x_i]
+                return sideset_bits
+
+            def iterset_bits_fnc(sideset_bits):
+                iterset_bits = full_iterset_bits
+                for y_i in utils.bitset_to_indexes(sideset_bits):
+                    iterset_bits &= side_to_iter_bits[y_i]
+                return iterset_bits
+        else:
+            def sideset_bits_fnc(comb_bits):
+                return sideset_fnc(utils.bitset_to_indexes(comb_bits))
+
+            def iterset_bits_fnc(sideset):
+                return utils.indexes_to_bitset(iterset_fnc(sideset))
+
+        # Found itersets are deduplicated by their bitsets.
+        # Hashing a python int takes time proportional to the number of its machine words (not of its set bits)
+        iter_elements_bits = utils.indexes_to_bitset(iter_concepts_to_check)
+        itersets_bits_set = set()
+        itersets_bits, sidesets_i = [], []
+        # Each combination is a pair (<bitset of the combination>, <the last element added to the combination or -1>).
+        # The combinations are kept in a stack (the next combination to check is the last one)
+        # to run a depth-first search
+        combinations_to_check = [(0, -1)] if initial_combinations is None else [
+            (utils.indexes_to_bitset(comb_i), comb_i[-1] if len(comb_i) > 0 else -1)
+            for comb_i in reversed(initial_combinations)]
+
+        while len(combinations_to_check) > 0:
+            comb_bits, comb_last = combinations_to_check.pop()
+            if closure_cache is not None and comb_bits in closure_cache:
+                sideset_i, iterset_bits = closure_cache[comb_bits]
+            else:
+                sideset_i = sideset_bits_fnc(comb_bits)
+                iterset_bits = iterset_bits_fnc(sideset_i)
+                if closure_cache is not None:
+                    closure_cache[comb_bits] = closure_cache[iterset_bits] = (sideset_i, iterset_bits)
+
+            # The closure should not add any element smaller than the last element of the combination
+            lower_elements_mask = (1 << comb_last) - 1 if comb_last > 0 else 0
+            is_not_lexicographic = (iterset_bits & ~comb_bits & lower_elements_mask) != 0
+            is_duplicate = iterset_bits in itersets_bits_set
+            if is_not_lexicographic or is_duplicate:
+                continue
+
+            itersets_bits_set.add(iterset_bits)
+            itersets_bits.append(iterset_bits)
+            sidesets_i.append(sideset_i)
+
+            # The elements to extend the iterset with: not in the iterset and greater than the last combination element
+            new_elements_bits = iter_elements_bits & ~iterset_bits & ~((1 << (comb_last + 1)) - 1)
+            # Push the new combinations in descending order so that the smallest new element is explored first
+            combinations_to_check.extend(
+                (iterset_bits | (1 << g_i), g_i) for g_i in reversed(utils.bitset_to_indexes(new_elements_bits)))
+
+        itersets_i = [tuple(utils.bitset_to_indexes(x_i)) for x_i in itersets_bits]
+        if is_formal_context:
+            sidesets_i = [utils.bitset_to_indexes(sideset_bits) for sideset_bits in sidesets_i]
 
-    while len(combinations_to_check) > 0:
-        comb_i = combinations_to_check.pop(0)
-        sideset_i = sideset_fnc(comb_i)
-        iterset_i = tuple(iterset_fnc(sideset_i))
-        iterset_i_new = sorted(set(iterset_i)-set(comb_i))
+    extents_i, intents_i = itersets_i, sidesets_i
+    if not iterate_extents:
+        extents_i, intents_i = intents_i, extents_i
 
-        is_not_lexicographic = len(comb_i) > 0 and any([g_i < comb_i[-1] for g_i in iterset_i_new])
-        is_duplicate = iterset_i in itersets_i_dict
-        if any([is_not_lexicographic, is_duplicate]):
-            continue
+    if output_as_concepts:
+        return list(iterate_concepts(context, extents_i, intents_i))
 
-        itersets_i_dict[iterset_i] = len(sidesets_i)
-        sidesets_i.append(sideset_i)
+    data = {'extents_i': extents_i, 'intents_i': intents_i}
+    return data
 
-        iterset_i = list(iterset_i)
 
-        new_combs = []
-        for g_i in iter_concepts_to_check:
-            if g_i not in iterset_i \
-                    and (len(comb_i) == 0 or g_i > comb_i[-1]):
-                new_combs.append(iterset_i+[g_i])
-        combinations_to_check = new_combs + combinations_to_check
+def iterate_concepts(
+        context: FormalContext or MVContext,
+        extents_i: Collection[Collection[int]], intents_i: Collection,
+        context_hash: int = None
+) -> Iterator[FormalConcept or PatternConcept]:
+    """Iterate concepts of ``context`` given by the indexes of their extents and intents
 
-    itersets_i = list({idx: x_i for x_i, idx in itersets_i_dict.items()}.values())
+    The concepts are constructed lazily. So one can skip the construction of unnecessary concepts
 
-    extents_i, intents_i = itersets_i, sidesets_i
-    if not iterate_extents:
-        extents_i, intents_i = intents_i, extents_i
+    Parameters
+    ----------
+    context: `FormalContext` or `MVContext`
+        A context the concepts are built on
+    extents_i: `list` of `list` of `int`
+        Indexes of objects of concepts extents
+    intents_i: `list` of `list` of `int` or `list` of `dict`
+        Indexes of attributes of concepts intents (for `FormalContext`)
+        or dicts of pattern structures descriptions (for `MVContext`)
+    context_hash: `int`
+        The hash of ``context``. Computed by ``context.hash_fixed()`` if not specified
 
-    if output_as_concepts:
-        object_names = context.object_names
-        attribute_names = context.attribute_names
-        context_hash = context.hash_fixed()
+    Returns
+    -------
+    concepts: iterator of `FormalConcept` or `PatternConcept`
+        Concepts of class `FormalConcept` (if given context is of type `FormalContext`)
+        or `PatternConcept` (if given context is of type `MVContext`)
 
-        concepts = []
-        for concept_data in zip(extents_i, intents_i):
-            extent_i, intent_i = concept_data
+    """
+    # Names are indexed for every concept. So they are stored in local tuples
+    object_names = tuple(context.object_names)
+    context_hash = context.hash_fixed() if context_hash is None else context_hash
+
+    if type(context) == FormalContext:
+        attribute_names = tuple(context.attribute_names)
+        for extent_i, intent_i in zip(extents_i, intents_i):
             extent = [object_names[g_i] for g_i in extent_i]
-            if type(context) == FormalContext:
-                intent = [attribute_names[m_i] for m_i in intent_i]
-                concept = FormalConcept(extent_i, extent, intent_i, intent, context_hash=context_hash)
-            else:
-                intent = {context.pattern_structures[ps_i].name: description for ps_i, description in intent_i.items()}
-                concept = PatternConcept(
-                    extent_i, extent, intent_i, intent,
-                    context.pattern_types, context.attribute_names,
-                    context_hash=context_hash)
-            concepts.append(concept)
-        return concepts
+            intent = [attribute_names[m_i] for m_i in intent_i]
+            yield FormalConcept(extent_i, extent, intent_i, intent, context_hash=context_hash)
+        return
 
-    data = {'extents_i': extents_i, 'intents_i': intents_i}
-    return data
+    ps_names = tuple(ps.name for ps in context.pattern_structures)
+    pattern_types, attribute_names = context.pattern_types, context.attribute_names
+    for extent_i, intent_i in zip(extents_i, intents_i):
+        extent = [object_names[g_i] for g_i in extent_i]
+        intent = {ps_names[ps_i]: description for ps_i, description in intent_i.items()}
+        yield PatternConcept(
+            extent_i, extent, intent_i, intent, pattern_types, attribute_names, context_hash=context_hash)
 
 
 def sofia_objectwise(
@@ -152,11 +248,14 @@ def sofia_objectwise(
         def concept_factory(ext_i, ext_, int_i, int_, hash_):
             return FormalConcept(ext_i, ext_, int_i, int_, context_hash=hash_)
 
-    def close_by_one_proj(K_, extents, i):
+    # The closures of the lattice concepts are passed to CbO in the cache. So CbO runs its python loop, not numba one.
+    # Each run of CbO only checks one new object. And the cached closures are slightly faster than the numba kernel
+    # which recomputes them (e.g. 5.35s against 5.64s on a random 200x30 context with L_max=100)
+    def close_by_one_proj(K_, extents, i, closure_cache):
         f = close_by_one(
             K_,
             initial_combinations=extents, iter_concepts_to_check=[i-1],
-            output_as_concepts=True, iterate_extents=True,
+            output_as_concepts=False, iterate_extents=True, closure_cache=closure_cache,
         )
         return f
 
@@ -177,27 +276,46 @@ def sofia_objectwise(
     # Step 1: Construct a lattice on a small enough subset of the context
     K_proj = K[:proj_start]
     L_proj = ConceptLattice.from_context(K_proj, algo='CbO')
+    # All the concepts share the hash of the whole context K. So a concept is only reconstructed if its extent changes
+    K_hash = K.hash_fixed()
 
     for proj_i in proj_iterator:
         # Step i.0: Update context projection
         K_proj = K[:proj_i]
 
         # Step i.1: Update old concepts to the new context
-        K_proj_hash = K_proj.hash_fixed()
-        for c in L_proj:
+        # The closures of updated concepts are already known. So there is no need to recompute them on Step i.2
+        closure_cache = {}
+        # Extents of the updated lattice concepts. An extent identifies a concept within the context projection
+        extents_proj = []
+        for c in list(L_proj):
             ext_i_new = K_proj.extension_i(c.intent_i)
-            ext_new = [K_proj.object_names[g_i] for g_i in ext_i_new]
-            c_new = concept_factory(ext_i_new, ext_new, c.intent_i, c.intent, K_proj_hash)
-            L_proj._update_element(c, c_new)
+            if len(ext_i_new) != c.support or c.context_hash != K_hash:
+                ext_new = [K_proj.object_names[g_i] for g_i in ext_i_new]
+                c_new = concept_factory(ext_i_new, ext_new, c.intent_i, c.intent, K_hash)
+                L_proj._update_element(c, c_new)
+                c = c_new
+            else:  # The measures of the concept were computed on a smaller projection. So they are outdated
+                c.measures.clear()
+            extents_proj.append(c.extent_i)
+
+            ext_bits = utils.indexes_to_bitset(ext_i_new)
+            int_cached = c.intent_i if is_K_multivalued else utils.indexes_to_bitset(c.intent_i)
+            closure_cache[ext_bits] = (int_cached, ext_bits)
 
         # Step i.2: Construct concepts on a new part of the context
-        extents_proj = [c.extent_i for c in L_proj]
-        new_concepts = close_by_one_proj(K_proj, extents_proj, proj_i)
+        new_data = close_by_one_proj(K_proj, extents_proj, proj_i, closure_cache)
 
         # Step i.3: Add new concepts to the lattice
 
-        # concepts that were changed during projection iteration
-        concepts_to_add = list(set(new_concepts) - set(L_proj))
+        # concepts that were changed during projection iteration. Only these concepts are constructed
+        extents_proj_set = set(extents_proj)
+        new_idxs = [i for i, ext_i in enumerate(new_data['extents_i']) if tuple(ext_i) not in extents_proj_set]
+        concepts_to_add = list(iterate_concepts(
+            K_proj,
+            [new_data['extents_i'][i] for i in new_idxs], [new_data['intents_i'][i] for i in new_idxs],
+            context_hash=K_hash
+        ))
         # sort concepts to ensure there will be no moment with multiple top or bottom concepts
         concepts_to_add = L_proj.sort_concepts(concepts_to_add)
         if len(concepts_to_add) >= 2 and concepts_to_add[-1] < L_proj[L_proj.bottom]:
@@ -210,11 +328,12 @@ def sofia_objectwise(
         if len(L_proj) > L_max:
             L_proj.calc_concepts_measures(measure_name, K_proj)
             measure_values = L_proj.measures[measure_name]
-            thold = sorted(measure_values)[::-1][L_max]
+            # (L_max+1)-th largest measure value. Found with a linear-time selection instead of a sort
+            thold = np.partition(measure_values, -L_max-1)[-L_max-1]
 
             top_i, bottom_i = L_proj.top, L_proj.bottom
-            concepts_to_remove = [i for i, v in enumerate(measure_values)
-                                  if v <= thold and i != top_i and i != bottom_i]
+            concepts_to_remove = [i for i in np.flatnonzero(measure_values <= thold).tolist()
+                                  if i != top_i and i != bottom_i]
 
             for c_i in concepts_to_remove[::-1]:
                 del L_proj[c_i]
@@ -263,12 +382,13 @@ def sofia_binary(
 
     def setup_projection_order(K_):
         max_proj_ = len(K_)
-        if proj_sorting == 'ascending':
-            def key_func(proj_i):
-                return len(K_.intention_i([proj_i]))
-        elif proj_sorting == 'descending':
+        if proj_sorting in {'ascending', 'descending'}:
+            # The supports of all projections are computed at once as the sums of the context rows
+            supports = list(K_.data.sum(axis=1))
+            sign = 1 if proj_sorting == 'ascending' else -1
+
             def key_func(proj_i):
-                return -len(K_.intention_i([proj_i]))
+                return sign * supports[proj_i]
         elif proj_sorting == 'random':
             rand_idxs = random.sample(range(max_proj_), k=max_proj_)
 
@@ -307,7 +427,7 @@ def sofia_binary(
         L = L.T
 
     for i, c in enumerate(L):
-        c_data = {k: v for k, v in c.__dict__.items() if not k.startswith('_')}
+        c_data = {f.name: getattr(c, f.name) for f in dataclasses.fields(c) if f.init}
         c_data['context_hash'] = K_hash
         L._update_element(c, c.__class__(**c_data))
 
@@ -354,7 +474,8 @@ def parse_decision_tree_to_extents(tree, X, n_jobs=1) -> List[Tuple[int, ...]]:
     X: `numpy.ndarray`
         An input data for ``tree`` model. The same format it is used for ``tree.predict(X)`` function
     n_jobs: `int`
-        A number of parallel jobs to run. WARNING: A number of jobs works slower than a single one.
+        Deprecated and ignored. The extents are retrieved in a single vectorized pass (faster than parallel jobs)
+
     Returns
     -------
     exts: `list` of `int`
@@ -363,20 +484,20 @@ def parse_decision_tree_to_extents(tree, X, n_jobs=1) -> List[Tuple[int, ...]]:
     """
     from sklearn.ensemble import RandomForestRegressor, RandomForestClassifier
 
+    if n_jobs != 1:
+        warnings.warn(
+            "Parameter ``n_jobs`` of parse_decision_tree_to_extents is deprecated and ignored. "
+            "It will be removed in future versions",
+            DeprecationWarning
+        )
+
     if isinstance(tree, (RandomForestClassifier, RandomForestRegressor)):
         paths = tree.decision_path(X)[0].tocsc()
     else:
         paths = tree.decision_path(X).tocsc()
 
-    def get_indices(i, paths):
-        return paths.indices[paths.indptr[i]:paths.indptr[i + 1]]
     paths = utils.sparse_unique_columns(paths)[0]
-
-    if n_jobs == 1:
-        exts = [get_indices(i, paths) for i in range(paths.shape[1])]
-    else:
-        from joblib import Parallel, delayed
-        exts = Parallel(n_jobs)([delayed(get_indices)(i, paths) for i in range(paths.shape[1])])
+    exts = np.split(paths.indices, paths.indptr[1:-1])
     exts = [tuple(ext) for ext in exts]
     return exts
 
@@ -416,22 +537,8 @@ def random_forest_concepts(context: MVContext, rf_params=None, rf_class=None):
     extents_i = parse_decision_tree_to_extents(rf, X)
     extents_i.append(context.extension_i(context.intention_i([])))
 
-    concepts = []
-
-    object_names = context.object_names
-    context_hash = context.hash_fixed()
-    for extent_i in extents_i:
-        extent = [object_names[g_i] for g_i in extent_i]
-        intent_i = context.intention_i(extent_i)
-        if type(context) == FormalContext:
-            intent = [context.attribute_names[m_i] for m_i in intent_i]
-            concept = FormalConcept(extent_i, extent, intent_i, intent, context_hash=context_hash)
-        else:
-            intent = {context.pattern_structures[ps_i].name: description for ps_i, description in intent_i.items()}
-            concept = PatternConcept(extent_i, extent, intent_i, intent,
-                                     context.pattern_types, context.attribute_names, context_hash=context_hash)
-        concepts.append(concept)
-
+    intents_i = [context.intention_i(extent_i) for extent_i in extents_i]
+    concepts = list(iterate_concepts(context, extents_i, intents_i))
     return concepts
 
 
@@ -463,39 +570,56 @@ def lindig_algorithm(context: FormalContext, iterate_extents=None):
 
     n_objects = context.n_objects
     n_attributes = context.n_attributes
-    intention_i = context.intention_i
-    extension_i = context.extension_i
-    object_names = context.object_names
-    attribute_names = context.attribute_names
+    object_names = tuple(context.object_names)
+    attribute_names = tuple(context.attribute_names)
     if not iterate_extents:
         n_objects, n_attributes = n_attributes, n_objects
-        intention_i, extension_i = extension_i, intention_i
         object_names, attribute_names = attribute_names, object_names
     context_hash = context.hash_fixed()
 
+    # Sets of objects and attributes are encoded as bitsets: python integers whose i-th bit is set iff i is in a set
+    iter_axis = 1 if iterate_extents else 0  # i.e. "objects" are the rows (or columns) of the data
+    objects_bits = context.data.to_bitsets(axis=iter_axis)
+    attributes_bits = context.data.to_bitsets(axis=1 - iter_axis)
+    all_objects_bits, all_attributes_bits = (1 << n_objects) - 1, (1 << n_attributes) - 1
+
+    # The same intents are met while looking for the neighbours of many concepts. So their extents are memoized
+    extensions_cache = {}
+
+    def extension_bits(intent_bits):
+        if intent_bits in extensions_cache:
+            return extensions_cache[intent_bits]
+
+        extent_bits = all_objects_bits
+        for m in utils.bitset_to_indexes(intent_bits):
+            extent_bits &= attributes_bits[m]
+        extensions_cache[intent_bits] = extent_bits
+        return extent_bits
+
+    def concept_factory(extent_bits, intent_bits):
+        G, M = utils.bitset_to_indexes(extent_bits), utils.bitset_to_indexes(intent_bits)
+        return FormalConcept(G, [object_names[i] for i in G],
+                             M, [attribute_names[i] for i in M],
+                             context_hash=context_hash)
 
     def direct_super_concepts(concept):
-        extent = set(concept.extent_i)
-        reps = set(range(n_objects)) - extent
+        extent_bits = concept.extent_bits
+        intent_bits = utils.indexes_to_bitset(concept.intent_i)
+        reps = all_objects_bits & ~extent_bits
         neighbors = []
-        for g in set(reps):
-            extent.add(g)
-            M = intention_i(list(extent))
-            G = extension_i(M)
-            extent.remove(g)
-            if len(reps & set(G)) == 1:
-                neighbors.append(FormalConcept(G, [object_names[i] for i in G],
-                                               M, [attribute_names[i] for i in M],
-                                               context_hash = context_hash))
+        # ``reps`` is an int, so the loop runs over a plain list snapshot of its elements (no set copy is needed)
+        for g in utils.bitset_to_indexes(reps):
+            # The intent of (extent | {g}) is computed incrementally from the intent of the extent
+            M_bits = intent_bits & objects_bits[g]
+            G_bits = extension_bits(M_bits)
+            reps_in_G = reps & G_bits
+            if reps_in_G & (reps_in_G - 1) == 0:  # i.e. g is the only element of reps in G
+                neighbors.append(concept_factory(G_bits, M_bits))
             else:
-                reps.remove(g)
+                reps ^= 1 << g  # g is still in reps: it is only removed here
         return neighbors
 
-    M = list(range(n_attributes))
-    G = extension_i(M)
-    c = FormalConcept(G, [object_names[i] for i in G],
-                      M, [attribute_names[i] for i in M],
-                      context_hash = context_hash)
+    c = concept_factory(extension_bits(all_attributes_bits), all_attributes_bits)
 
     concepts = [c]
     queue = {c}
@@ -8,12 +8,17 @@ and there is no other concept between these two.
 
 """
 from copy import deepcopy
+from collections import deque
 from typing import Collection
 
 from fcapy.lattice.formal_concept import FormalConcept
 from fcapy.lattice.pattern_concept import PatternConcept
 from fcapy.utils import utils
 
+from fcapy import LIB_INSTALLED
+if LIB_INSTALLED['numpy']:
+    import numpy as np
+
 
 def complete_comparison(
         concepts: Collection[FormalConcept or PatternConcept],
@@ -49,6 +54,20 @@ def complete_comparison(
                 subconcepts.add(b_i)
         return subconcepts
 
+    if _is_bulk_comparable(concepts):
+        extents, supports = _pack_extents(concepts)
+        is_monotone = next(iter(concepts)).is_monotone
+
+        def get_subconcepts(a_i, a, concepts):
+            # b < a iff the extent of b is a proper subset of the extent of a (and vice versa for monotone concepts)
+            if not is_monotone:
+                flags = ~(extents & ~extents[a_i]).any(axis=1) & (supports < supports[a_i])
+            else:
+                flags = ~(extents[a_i] & ~extents).any(axis=1) & (supports > supports[a_i])
+            if is_concepts_sorted:
+                flags[:a_i] = False
+            return set(np.flatnonzero(flags).tolist())
+
     if n_jobs == 1:
         all_subconcepts = []
         for a_i, a in utils.safe_tqdm(enumerate(concepts), total=len(concepts),
@@ -75,6 +94,27 @@ def complete_comparison(
     return subconcepts_dict
 
 
+def _is_bulk_comparable(concepts: Collection[FormalConcept or PatternConcept]) -> bool:
+    """Check if ``concepts`` can be compared all at once through the matrix of their extents"""
+    if not LIB_INSTALLED['numpy'] or len(concepts) == 0:
+        return False
+
+    c0 = next(iter(concepts))
+    return all(type(c) is FormalConcept and c.context_hash == c0.context_hash and c.is_monotone == c0.is_monotone
+               for c in concepts)
+
+
+def _pack_extents(concepts: Collection[FormalConcept]):
+    """Return the extents of ``concepts`` as rows of packed bits (i.e. one contiguous buffer) and their supports"""
+    supports = np.array([len(c.extent_i) for c in concepts], dtype=np.int64)
+    extents_bits = [c.extent_bits for c in concepts]
+    n_bytes = max((-(-bits.bit_length() // 8) for bits in extents_bits), default=0)
+
+    # The i-th bit of an extent bitset is the i-th bit of its little-endian bytes
+    packed = b''.join(bits.to_bytes(n_bytes, 'little') for bits in extents_bits)
+    return np.frombuffer(packed, dtype=np.uint8).reshape(len(concepts), n_bytes), supports
+
+
 def construct_spanning_tree(concepts, is_concepts_sorted=False, use_tqdm=False):
     """Return a spanning tree of subconcepts relation on given ``concepts``.
 
@@ -517,11 +557,11 @@ def add_concept(new_concept, concepts, subconcepts_dict, superconcepts_dict,
         bottom_concept_i = new_concept_i
     else:
         # find direct superconcepts
-        concepts_to_visit = [top_concept_i]
+        concepts_to_visit = deque([top_concept_i])
         visited_concepts = set()
         direct_superconcepts = set()
         while len(concepts_to_visit) > 0:
-            c_i = concepts_to_visit.pop(0)
+            c_i = concepts_to_visit.popleft()
             visited_concepts.add(c_i)
 
             subconcepts = {subc_i for subc_i in subconcepts_dict[c_i]
@@ -532,11 +572,11 @@ def add_concept(new_concept, concepts, subconcepts_dict, superconcepts_dict,
                 direct_superconcepts.add(c_i)
 
         # find direct subconcepts
-        concepts_to_visit = [bottom_concept_i]
+        concepts_to_visit = deque([bottom_concept_i])
         visited_concepts = set()
         direct_subconcepts = set()
         while len(concepts_to_visit) > 0:
-            c_i = concepts_to_visit.pop(0)
+            c_i = concepts_to_visit.popleft()
             visited_concepts.add(c_i)
             superconcepts = {supc_i for supc_i in superconcepts_dict[c_i]
                              if new_concept > concepts[supc_i]}
@@ -13,6 +13,8 @@ Modules
     Implements Formal Context class
   bintable:
     Implements BinTable class
+  bintable_numba:
+    Contains Numba-compiled reductions of a binary table used by BinTableLists class
   converters:
     Contains function to read/write a FormalContext object from/to a file
 
@@ -3,6 +3,7 @@ This module offers a class BinTable to work with binary table efficiently.
 
 """
 from abc import ABCMeta, abstractmethod
+from itertools import compress
 from typing import List, Tuple, Optional, Collection, Union
 
 from fcapy.context import bintable_errors as berrors
@@ -14,6 +15,9 @@ from bitarray import frozenbitarray as fbarray, bitarray as barray, util as buti
 import numpy as np
 import numpy.typing as npt
 
+if LIB_INSTALLED['numba']:
+    from fcapy.context import bintable_numba
+
 
 class AbstractBinTable(metaclass=ABCMeta):
     Row_DType = Collection[bool]
@@ -21,15 +25,28 @@ class AbstractBinTable(metaclass=ABCMeta):
     def __init__(self, data: List[Row_DType] = None):
         self.data = data
 
+    @classmethod
+    def _from_validated(cls, data) -> 'AbstractBinTable':
+        """Construct a BinTable from valid ``data`` (e.g. a slice of another BinTable) without validating it"""
+        bintable = cls.__new__(cls)
+        bintable._set_data(data, validate=False)
+        return bintable
+
     @property
     def data(self) -> Collection:
         return self._data
 
     @data.setter
     def data(self, value):
-        data, h, w = self._transform_data(value)
-        self._validate_data(data)
+        self._set_data(value)
+
+    def _set_data(self, data, validate: bool = True):
+        """Set the ``data`` of the table. Validate it only if ``validate`` is True"""
+        data, h, w, is_validated = self._transform_data(data)
+        if validate and not is_validated:
+            self._validate_data(data)
         self._data, self._height, self._width = data, h, w
+        self._hash = None  # The hash of the data. Computed lazily by ``__hash__``
 
     @property
     def height(self) -> Optional[int]:
@@ -45,7 +62,7 @@ class AbstractBinTable(metaclass=ABCMeta):
 
     @property
     def T(self) -> 'AbstractBinTable':
-        return self.__class__([self._get_column(range(self.height), col_i) for col_i in range(self.width)])
+        return self._from_validated([self._get_column(range(self.height), col_i) for col_i in range(self.width)])
 
     def all(self, axis: int = None, rows: Collection[int] = None, columns: Collection[int] = None)\
             -> bool or Collection[bool]:
@@ -62,10 +79,10 @@ class AbstractBinTable(metaclass=ABCMeta):
     def all_i(self, axis: int, rows: Collection[int] = None, columns: Collection[int] = None) -> Collection[int]:
         flg_all = self.all(axis, rows, columns)
         if axis == 0:
-            iterator = zip(columns, flg_all) if columns is not None else enumerate(flg_all)
+            indexes = columns if columns is not None else range(self.width)
         else:  # axis == 1
-            iterator = zip(rows, flg_all) if rows is not None else enumerate(flg_all)
-        return [i for i, flg in iterator if flg]
+            indexes = rows if rows is not None else range(self.height)
+        return list(compress(indexes, flg_all))
 
     def any(self, axis: int = None, rows: Collection[int] = None, columns: Collection[int] = None)\
             -> bool or Row_DType:
@@ -81,13 +98,11 @@ class AbstractBinTable(metaclass=ABCMeta):
 
     def any_i(self, axis: int, rows: Collection[int] = None, columns: Collection[int] = None) -> Collection[int]:
         flg_any = self.any(axis, rows, columns)
-
         if axis == 0:
-            iterator = zip(columns, flg_any) if columns is not None else enumerate(flg_any)
+            indexes = columns if columns is not None else range(self.width)
         else:  # axis == 1
-            iterator = zip(rows, flg_any) if rows is not None else enumerate(flg_any)
-
-        return [i for i, flg in iterator if flg]
+            indexes = rows if rows is not None else range(self.height)
+        return list(compress(indexes, flg_any))
 
     def sum(self, axis: int = None, rows: Collection[int] = None, columns: Collection[int] = None)\
             -> int or Collection[int]:
@@ -107,7 +122,30 @@ class AbstractBinTable(metaclass=ABCMeta):
     def to_tuple(self) -> Tuple[Tuple[bool, ...], ...]:
         return tuple([tuple(row) for row in self.to_list()])
 
+    def to_bitsets(self, axis: int) -> List[int]:
+        """Return rows (if ``axis`` = 1) or columns (if ``axis`` = 0) of the table encoded as bitsets
+
+        A bitset is a python int whose i-th bit is set iff the i-th value of the row (column) is True
+        """
+        if axis not in {0, 1}:
+            raise ValueError(f'Unsupported axis value: {axis}. Possible values are 0 (columns) and 1 (rows)')
+
+        if axis == 1:
+            return self._rows_to_bitsets()
+        return self._columns_to_bitsets()
+
+    def _rows_to_bitsets(self) -> List[int]:
+        return [sum(1 << i for i, v in enumerate(row) if v) for row in self.to_list()]
+
+    def _columns_to_bitsets(self) -> List[int]:
+        return [sum(1 << i for i, v in enumerate(column) if v) for column in zip(*self.to_list())]
+
     def __hash__(self):
+        if self._hash is None:
+            self._hash = self._calc_hash()
+        return self._hash
+
+    def _calc_hash(self) -> int:
         return hash(self.to_tuple())
 
     def __eq__(self, other: 'AbstractBinTable') -> bool:
@@ -119,29 +157,30 @@ class AbstractBinTable(metaclass=ABCMeta):
 
     def __and__(self, other: 'AbstractBinTable') -> 'AbstractBinTable':
         assert self.shape == other.shape
-        return self.__class__(self.data & other.data)
+        return self._from_validated(self.data & other.data)
 
     def __or__(self, other: 'AbstractBinTable') -> 'AbstractBinTable':
         assert self.shape == other.shape
-        return self.__class__(self.data | other.data)
+        return self._from_validated(self.data | other.data)
 
     def __invert__(self) -> 'AbstractBinTable':
-        return self.__class__(~self.data)
+        return self._from_validated(~self.data)
 
     @abstractmethod
     def _validate_data(self, data) -> bool:
         ...
 
-    def _transform_data(self, data) -> Tuple[Collection, int, Optional[int]]:
+    def _transform_data(self, data) -> Tuple[Collection, int, Optional[int], bool]:
+        """Return the data in the format of the class, its height and width, and whether it has been validated"""
         if data is None or len(data) == 0:
-            return [], 0, 0
+            return [], 0, 0, False
 
         dclass = self.decide_dataclass(data)
         if dclass == self.__class__.__name__:
-            return self._transform_data_inherent(data)
+            return (*self._transform_data_inherent(data), False)
 
-        bt = BINTABLE_CLASSES[dclass](data)
-        return self._transform_data_fromlists(bt.to_list()), bt.height, bt.width
+        bt = BINTABLE_CLASSES[dclass](data)  # The data is validated by ``bt``
+        return self._transform_data_fromlists(bt.to_list()), bt.height, bt.width, True
 
     @staticmethod
     def _transform_data_inherent(data) -> Tuple[Collection, int, int]:
@@ -197,12 +236,15 @@ class AbstractBinTable(metaclass=ABCMeta):
         if isinstance(item, (slice, list)):
             return self._get_subtable(item, None)
         if isinstance(item, tuple):
-            single_slices = tuple([isinstance(x, int) for x in item])
-            func_dict = {
-                (True, True): self._get_item, (True, False): self._get_row,
-                (False, True): self._get_column, (False, False): self._get_subtable
-            }
-            return func_dict[single_slices](*item)
+            row_slicer, column_slicer = item
+            is_single_row, is_single_column = isinstance(row_slicer, int), isinstance(column_slicer, int)
+            if is_single_row:
+                if is_single_column:
+                    return self._get_item(row_slicer, column_slicer)
+                return self._get_row(row_slicer, column_slicer)
+            if is_single_column:
+                return self._get_column(row_slicer, column_slicer)
+            return self._get_subtable(row_slicer, column_slicer)
 
         raise NotImplementedError("Unknown `item` to slice the BinTable")
 
@@ -220,8 +262,8 @@ class AbstractBinTable(metaclass=ABCMeta):
     def _get_subtable(self, row_slicer: List[int] or slice, column_slicer: List[int] or slice or None)\
             -> "AbstractBinTable":
         if column_slicer is None:
-            return self.__class__(self.data[row_slicer])
-        return self.__class__(self.data[row_slicer, column_slicer])
+            return self._from_validated(self.data[row_slicer])
+        return self._from_validated(self.data[row_slicer, column_slicer])
 
     @staticmethod
     def decide_dataclass(data: Collection) -> str:
@@ -242,22 +284,50 @@ class BinTableLists(AbstractBinTable):
     data: List[List[bool]]  # Updating type hint
     Row_DType = List[bool]
 
+    def _set_data(self, data, validate: bool = True):
+        super()._set_data(data, validate)
+        # A copy of the data as numpy.uint8 array. Constructed lazily for vectorized reductions.
+        # The copy does not follow in-place edits of the rows. So the data should be replaced rather than edited
+        self._data_u8 = None
+
     def to_list(self) -> List[List[bool]]:
         return self.data
 
+    def _u8_args(self, rows: List[int] = None, columns: List[int] = None)\
+            -> Tuple[npt.NDArray[np.uint8], npt.NDArray[int], npt.NDArray[int]]:
+        """Return the data as `numpy.uint8` array and the indexes of ``rows`` and ``columns`` as `numpy.int64` arrays
+
+        The output can be passed directly to the reductions from `bintable_numba` module.
+        """
+        if self._data_u8 is None:
+            # Python bools are converted to numpy bools faster than to numbers. And a view of bools as uint8 is free
+            self._data_u8 = np.array(self.data, dtype=bool).reshape(self.height, self.width).view(np.uint8)
+        rows = np.arange(self.height) if rows is None else np.array(rows, dtype=np.int64)
+        columns = np.arange(self.width) if columns is None else np.array(columns, dtype=np.int64)
+        return self._data_u8, rows, columns
+
+    def _u8_subtable(self, rows: List[int] = None, columns: List[int] = None) -> npt.NDArray[np.uint8]:
+        """Return the subtable of the data on ``rows`` and ``columns`` as `numpy.uint8` array"""
+        data_u8, rows_, columns_ = self._u8_args(rows, columns)
+        if rows is None and columns is None:
+            return data_u8
+        return data_u8[np.ix_(rows_, columns_)]
+
     def _validate_data(self, data: List[Row_DType]) -> bool:
         if len(data) == 0:
             return True
 
-        t_, l_ = type(data[0]), len(data[0])
+        t_ = type(data[0])
+        if not all(type(row) is t_ for row in data):
+            raise berrors.UnmatchedTypeError(next(i for i, row in enumerate(data) if type(row) is not t_))
+
+        if len(set(map(len, data))) > 1:
+            l_ = len(data[0])
+            raise berrors.UnmatchedLengthError(next(i for i, row in enumerate(data) if len(row) != l_))
+
         for i, row in enumerate(data):
-            if type(row) != t_:
-                raise berrors.UnmatchedTypeError(i)
-            if len(row) != l_:
-                raise berrors.UnmatchedLengthError(i)
-            for v in row:
-                if not isinstance(v, bool):
-                    raise berrors.NotBooleanValueError(i)
+            if not all(type(v) is bool for v in row):
+                raise berrors.NotBooleanValueError(i)
 
         return True
 
@@ -282,24 +352,16 @@ class BinTableLists(AbstractBinTable):
         return True
 
     def _all_per_row(self, rows: List[int] = None, columns: List[int] = None) -> Row_DType:
-        rows = range(self.height) if rows is None else rows
-        if columns is None:
-            return [all(self.data[i]) for i in rows]
-        return [all([self.data[i][j] for j in columns]) for i in rows]
+        if LIB_INSTALLED['numba']:
+            return bintable_numba.all_per_row(*self._u8_args(rows, columns)).tolist()
+
+        return self._u8_subtable(rows, columns).all(axis=1).tolist()
 
     def _all_per_column(self, rows: List[int] = None, columns: List[int] = None) -> Row_DType:
-        rows = range(self.height) if rows is None else rows
-        if columns is None:
-            vals, columns = [True] * self.width, range(self.width)
-        else:
-            vals = [True] * len(columns)
+        if LIB_INSTALLED['numba']:
+            return bintable_numba.all_per_column(*self._u8_args(rows, columns)).tolist()
 
-        for i in rows:
-            row = self.data[i]
-            vals = [v & row[col_i] for v, col_i in zip(vals, columns)]
-            if not any(vals):  # All values are False
-                break
-        return vals
+        return self._u8_subtable(rows, columns).all(axis=0).tolist()
 
     def _any(self, rows: List[int] = None, columns: List[int] = None) -> bool:
         rows = range(self.height) if rows is None else rows
@@ -316,45 +378,31 @@ class BinTableLists(AbstractBinTable):
         return False
 
     def _any_per_row(self, rows: List[int] = None, columns: List[int] = None) -> Row_DType:
-        rows = range(self.height) if rows is None else rows
-        if columns is None:
-            return [any(self.data[i]) for i in rows]
-        return [any([self.data[i][j] for j in columns] for i in rows)]
+        if LIB_INSTALLED['numba']:
+            return bintable_numba.any_per_row(*self._u8_args(rows, columns)).tolist()
+
+        return self._u8_subtable(rows, columns).any(axis=1).tolist()
 
     def _any_per_column(self, rows: List[int] = None, columns: List[int] = None) -> Row_DType:
-        rows = range(self.height) if rows is None else rows
-        if columns is None:
-            vals, columns = range(self.width), [False] * self.width
-        else:
-            vals = [False] * len(columns)
+        if LIB_INSTALLED['numba']:
+            return bintable_numba.any_per_column(*self._u8_args(rows, columns)).tolist()
 
-        for i in rows:
-            row = self.data[i]
-            vals = [v | row[col_i] for v, col_i in zip(vals, columns)]
-            if all(vals):  # All values are True
-                break
-        return vals
+        return self._u8_subtable(rows, columns).any(axis=0).tolist()
 
     def _sum(self, rows: List[int] = None, columns: List[int] = None) -> int:
         return sum(self._sum_per_row(rows, columns))
 
     def _sum_per_row(self, rows: List[int] = None, columns: List[int] = None) -> List[int]:
-        rows = range(self.height) if rows is None else rows
-        if columns is None:
-            return [sum(self.data[i]) for i in rows]
-        return [sum([self.data[i][j] for j in columns]) for i in rows]
+        if LIB_INSTALLED['numba']:
+            return bintable_numba.sum_per_row(*self._u8_args(rows, columns)).tolist()
+
+        return self._u8_subtable(rows, columns).sum(axis=1, dtype=np.int64).tolist()
 
     def _sum_per_column(self, rows: List[int] = None, columns: List[int] = None) -> List[int]:
-        rows = range(self.height) if rows is None else rows
-        if columns is None:
-            vals, columns = range(self.width), [0] * self.width
-        else:
-            vals = [0] * len(columns)
+        if LIB_INSTALLED['numba']:
+            return bintable_numba.sum_per_column(*self._u8_args(rows, columns)).tolist()
 
-        for i in rows:
-            row = self.data[i]
-            vals = [v + int(row[col_i]) for v, col_i in zip(vals, columns)]
-        return vals
+        return self._u8_subtable(rows, columns).sum(axis=0, dtype=np.int64).tolist()
 
     def _get_row(self, row_idx: int, column_slicer: List[int] or slice = None) -> Row_DType:
         row = self.data[row_idx]
@@ -382,36 +430,74 @@ class BinTableLists(AbstractBinTable):
                 column_slicer = range(*column_slicer.indices(self.width))
             subtable = [[self.data[row_i][col_i] for col_i in column_slicer] for row_i in row_slicer]
 
-        return self.__class__(subtable)
+        return self._from_validated(subtable)
 
     def __and__(self, other: 'BinTableLists') -> 'BinTableLists':
         assert self.shape == other.shape
         intersection = [[a and b for a, b in zip(row_a, row_b)] for row_a, row_b in zip(self.data, other.data)]
-        return self.__class__(intersection)
+        return self._from_validated(intersection)
 
     def __or__(self, other: 'BinTableLists') -> 'BinTableLists':
         assert self.shape == other.shape
         intersection = [[a or b for a, b in zip(row_a, row_b)] for row_a, row_b in zip(self.data, other.data)]
-        return self.__class__(intersection)
+        return self._from_validated(intersection)
 
     def __invert__(self) -> 'BinTableLists':
         data_neg = [[not v for v in row] for row in self.data]
-        return self.__class__(data_neg)
+        return self._from_validated(data_neg)
 
 
 class BinTableNumpy(AbstractBinTable):
     data: npt.NDArray[bool]  # Updating type hint
     Row_DType = npt.NDArray[bool]
+    # The number of set bits in each byte value. Used to count True values in the packed data
+    POPCOUNT_PER_BYTE = np.array([bin(i).count('1') for i in range(256)], dtype=np.uint8)
+
+    def _set_data(self, data, validate: bool = True):
+        super()._set_data(data, validate)
+        # Row-wise reductions are computed over the rows packed into bits (8 values per byte).
+        # So they read 8 times less memory than the reductions over the boolean data
+        if len(self._data) > 0:
+            # The packed data would not follow in-place edits of the data. So the data is made read-only
+            # (via a view in order not to change the flags of the array passed by the user)
+            self._data = self._data.view()
+            self._data.flags.writeable = False
+            self._data_packed = np.packbits(self._data, axis=1)
+            self._full_row_mask = np.packbits(np.ones(self._width, dtype=bool))
+        else:
+            self._data_packed, self._full_row_mask = None, None
 
     @property
     def T(self) -> 'BinTableNumpy':
-        return self.__class__(self.data.T)
+        return self._from_validated(self.data.T)
+
+    def _columns_to_bitsets(self) -> List[int]:
+        if self._data_packed is None:
+            return []
+        # The i-th bit of a bitset is the i-th bit of little-endian bytes of the column packed into bits
+        columns_packed = np.packbits(self.data.T, axis=1, bitorder='little')
+        return [int.from_bytes(column.tobytes(), 'little') for column in columns_packed]
+
+    def _slice_packed(self, rows: npt.NDArray[int] = None, columns: npt.NDArray[int] = None)\
+            -> Tuple[npt.NDArray[np.uint8], npt.NDArray[np.uint8]]:
+        """Return the packed rows of the table and the packed mask of the selected columns"""
+        data_packed = self._data_packed if rows is None else self._data_packed[rows]
+        if columns is None:
+            return data_packed, self._full_row_mask
+
+        columns_flags = np.zeros(self.width, dtype=bool)
+        columns_flags[columns] = True
+        return data_packed, np.packbits(columns_flags)
 
     def all(self, axis: int = None, rows: npt.NDArray[int] = None, columns: npt.NDArray[int] = None)\
             -> Union[bool, Row_DType]:
         if axis not in {None, 0, 1}:
             raise berrors.UnknownAxisError(axis)
 
+        if axis == 1 and self._data_packed is not None:
+            data_packed, columns_mask = self._slice_packed(rows, columns)
+            return ((data_packed & columns_mask) == columns_mask).all(axis=1)
+
         data_slice = self.data
         if rows is not None:
             data_slice = data_slice[rows]
@@ -427,6 +513,10 @@ class BinTableNumpy(AbstractBinTable):
         if axis not in {None, 0, 1}:
             raise berrors.UnknownAxisError(axis)
 
+        if axis == 1 and self._data_packed is not None:
+            data_packed, columns_mask = self._slice_packed(rows, columns)
+            return (data_packed & columns_mask).any(axis=1)
+
         data_slice = self.data
         if rows is not None:
             data_slice = data_slice[rows]
@@ -442,6 +532,11 @@ class BinTableNumpy(AbstractBinTable):
         if axis not in {None, 0, 1}:
             raise berrors.UnknownAxisError(axis)
 
+        # Repeated columns are counted several times. So the packed data is only used when all columns are selected
+        if axis == 1 and columns is None and self._data_packed is not None:
+            data_packed, _ = self._slice_packed(rows)
+            return self.POPCOUNT_PER_BYTE[data_packed].sum(axis=1, dtype=int)
+
         data_slice = self.data
         if rows is not None:
             data_slice = data_slice[rows]
@@ -455,10 +550,9 @@ class BinTableNumpy(AbstractBinTable):
     def all_i(self, axis: int, rows: npt.NDArray[int] = None, columns: npt.NDArray[int] = None) -> npt.NDArray[int]:
         flg_all = self.all(axis, rows, columns)
 
-        if axis == 0:
-            full_ar = np.arange(self.width) if columns is None else columns
-        else:  # axis == 1
-            full_ar = np.arange(self.height) if rows is None else rows
+        full_ar = columns if axis == 0 else rows
+        if full_ar is None:
+            return np.flatnonzero(flg_all)
 
         if not isinstance(full_ar, np.ndarray):
             full_ar = np.array(full_ar)
@@ -468,10 +562,9 @@ class BinTableNumpy(AbstractBinTable):
     def any_i(self, axis: int, rows: npt.NDArray[int] = None, columns: npt.NDArray[int] = None) -> npt.NDArray[int]:
         flg_any = self.any(axis, rows, columns)
 
-        if axis == 0:
-            full_ar = np.arange(self.width) if columns is None else columns
-        else:  # axis == 1
-            full_ar = np.arange(self.height) if rows is None else rows
+        full_ar = columns if axis == 0 else rows
+        if full_ar is None:
+            return np.flatnonzero(flg_any)
 
         if not isinstance(full_ar, np.ndarray):
             full_ar = np.array(full_ar)
@@ -531,10 +624,15 @@ class BinTableNumpy(AbstractBinTable):
             return False
         if self.width != other.width:
             return False
-        return (self.data == other.data).all()
+        if isinstance(other, BinTableNumpy) and self._data_packed is not None and other._data_packed is not None:
+            # Compare the packed rows: that is a memcmp over 8 times less bytes without temporary boolean arrays
+            return self._data_packed.tobytes() == other._data_packed.tobytes()
+        return np.array_equal(self.data, other.data)
 
-    def __hash__(self):
-        return hash(self.to_tuple())
+    __hash__ = AbstractBinTable.__hash__
+
+    def _calc_hash(self) -> int:
+        return hash((self.shape, np.ascontiguousarray(self.data, dtype=bool).tobytes()))
 
 
 class BinTableBitarray(AbstractBinTable):
@@ -565,6 +663,20 @@ class BinTableBitarray(AbstractBinTable):
     def _transform_data_fromlists(data: List[List[bool]]) -> List[Row_DType]:
         return [fbarray(row) for row in data]
 
+    def to_list(self) -> List[List[bool]]:
+        if not self.height or not self.width:
+            return [[] for _ in range(self.height)]
+
+        # Unpack the bytes of all the rows at once and let numpy convert the bits into python bools
+        n_bytes = -(-self.width // 8)
+        bytes_matrix = np.frombuffer(b''.join([row.tobytes() for row in self.data]), dtype=np.uint8)
+        bitorder = 'big' if self.data[0].endian() == 'big' else 'little'
+        flags = np.unpackbits(bytes_matrix.reshape(self.height, n_bytes), axis=1, count=self.width, bitorder=bitorder)
+        return flags.astype(bool).tolist()
+
+    def _rows_to_bitsets(self) -> List[int]:
+        return [int(row.to01()[::-1] or '0', 2) for row in self.data]
+
     def _validate_data(self, data: List[fbarray]) -> bool:
         if len(data) == 0:
             return True
@@ -617,7 +729,7 @@ class BinTableBitarray(AbstractBinTable):
             mask = fbarray([j in columns_set for j in range(self.width)])
             for i in rows:
                 vals &= self.data[i]
-                if not (vals & mask).any():  # If all values are False
+                if not butil.any_and(vals, mask):  # If all values are False
                     break
 
             vals = fbarray([vals[i] for i in columns])
@@ -659,18 +771,25 @@ class BinTableBitarray(AbstractBinTable):
                     break
         else:
             columns_set = set(columns)
-            mask = fbarray([j not in columns_set for j in range(self.width)])
+            mask = fbarray([j in columns_set for j in range(self.width)])
 
             for i in rows:
                 vals |= self.data[i]
-                if (vals | mask).all():
+                if butil.subset(mask, vals):  # If all values are True
                     break
 
             vals = fbarray([vals[i] for i in columns])
         return vals
 
     def _sum(self, rows: List[int] = None, columns: List[int] = None) -> int:
-        return sum(self._sum_per_row(rows, columns))
+        # The set bits of each row are counted in C. So the only overhead to reduce is the python loop over the rows
+        data = self.data if rows is None else map(self.data.__getitem__, rows)
+        if columns is None:
+            return sum(map(fbarray.count, data))
+
+        columns = set(columns)
+        mask = fbarray([j in columns for j in range(self.width)])
+        return sum([butil.count_and(row, mask) for row in data])
 
     def _sum_per_row(self, rows: List[int] = None, columns: List[int] = None) -> List[int]:
         rows = range(self.height) if rows is None else rows
@@ -679,25 +798,27 @@ class BinTableBitarray(AbstractBinTable):
 
         columns = set(columns)
         mask = fbarray([j in columns for j in range(self.width)])
-        return [(self.data[i] & mask).count() for i in rows]
+        return [butil.count_and(self.data[i], mask) for i in rows]
 
     def _sum_per_column(self, rows: List[int] = None, columns: List[int] = None) -> List[int]:
         rows = range(self.height) if rows is None else rows
-        if columns is None:
-            vals = [0] * self.width
-            for i in rows:
-                for j in self.data[i].search(1):
-                    vals[j] += 1
-        else:
-            vals = [0] * len(columns)
+        if len(rows) == 0 or not self.width:
+            return [0] * (self.width if columns is None else len(columns))
 
-            columns_set = set(columns)
-            mask = fbarray([j in columns_set for j in range(self.width)])
-            for i in rows:
-                for j in (self.data[i] & mask).search(1):
-                    vals[j] += 1
+        # Stack the bytes of the rows into a matrix and count the set bits of each bit position in the matrix columns
+        n_bytes = -(-self.width // 8)
+        bytes_matrix = np.frombuffer(b''.join([self.data[i].tobytes() for i in rows]), dtype=np.uint8)
+        bytes_matrix = bytes_matrix.reshape(len(rows), n_bytes)
 
-        return vals
+        is_big_endian = self.data[rows[0]].endian() == 'big'
+        counts = np.empty((n_bytes, 8), dtype=int)
+        for bit_i in range(8):
+            counts[:, bit_i] = ((bytes_matrix >> (7 - bit_i if is_big_endian else bit_i)) & 1).sum(axis=0)
+        counts = counts.reshape(-1)[:self.width]
+
+        if columns is not None:
+            counts = counts[list(columns)]
+        return counts.tolist()
 
     def _get_row(self, row_idx: int, column_slicer: List[int] or slice = None) -> Row_DType:
         row = self.data[row_idx]
@@ -724,7 +845,7 @@ class BinTableBitarray(AbstractBinTable):
         else:
             subtable = [fbarray([self.data[row_i][col_i] for col_i in column_slicer]) for row_i in row_slicer]
 
-        return self.__class__(subtable)
+        return self._from_validated(subtable)
 
     def __eq__(self, other: 'BinTableBitarray'):
         if self.height != other.height:
@@ -733,22 +854,24 @@ class BinTableBitarray(AbstractBinTable):
             return False
         return self.data == other.data
 
-    def __hash__(self):
+    __hash__ = AbstractBinTable.__hash__
+
+    def _calc_hash(self) -> int:
         return hash(tuple(self.data))
 
     def __and__(self, other: 'BinTableBitarray') -> 'BinTableBitarray':
         assert self.shape == other.shape
         intersection = [row_a & row_b for row_a, row_b in zip(self.data, other.data)]
-        return self.__class__(intersection)
+        return self._from_validated(intersection)
 
     def __or__(self, other: 'BinTableBitarray') -> 'BinTableBitarray':
         assert self.shape == other.shape
         intersection = [row_a | row_b for row_a, row_b in zip(self.data, other.data)]
-        return self.__class__(intersection)
+        return self._from_validated(intersection)
 
     def __invert__(self) -> 'BinTableBitarray':
         data_neg = [~row for row in self.data]
-        return self.__class__(data_neg)
+        return self._from_validated(data_neg)
 
 
 class BinTableOneBitarray(AbstractBinTable):
@@ -761,7 +884,7 @@ class BinTableOneBitarray(AbstractBinTable):
     def T(self) -> 'BinTableOneBitarray':
         bars_trans = [self.data[0][j::self.width] for j in range(self.width)]
         data_T = self._transform_data_fromlists(bars_trans)
-        return self.__class__(data_T)
+        return self._from_validated(data_T)
 
     def all_i(self, axis: int, rows: List[int] = None, columns: List[int] = None) -> List[int]:
         flg_all = self.all(axis, rows, columns)
@@ -922,12 +1045,12 @@ class BinTableOneBitarray(AbstractBinTable):
     def _get_subtable(self, row_slicer: List[int] or slice or None, column_slicer: List[int] or slice or None) \
             -> 'BinTableOneBitarray':
         if row_slicer is None and column_slicer is None:
-            return self.__class__(self.data)
+            return self._from_validated(self.data)
 
         if isinstance(row_slicer, slice):
             row_slicer = range(*row_slicer.indices(self.height))
         subtable = [self._get_row(row_i, column_slicer) for row_i in row_slicer]
-        return self.__class__((subtable, len(row_slicer)))
+        return self._from_validated((subtable, len(row_slicer)))
 
     def __eq__(self, other: 'BinTableOneBitarray'):
         if self.height != other.height:
@@ -940,13 +1063,13 @@ class BinTableOneBitarray(AbstractBinTable):
         return hash(self.data)
 
     def __and__(self, other: 'BinTableOneBitarray') -> 'BinTableOneBitarray':
-        return self.__class__((self.data[0] & other.data[0], self.data[1]))
+        return self._from_validated((self.data[0] & other.data[0], self.data[1]))
 
     def __or__(self, other: 'BinTableOneBitarray') -> 'BinTableOneBitarray':
-        return self.__class__((self.data[0] | other.data[0], self.data[1]))
+        return self._from_validated((self.data[0] | other.data[0], self.data[1]))
 
     def __invert__(self) -> 'BinTableOneBitarray':
-        return self.__class__((~self.data[0], self.data[1]))
+        return self._from_validated((~self.data[0], self.data[1]))
 
 
 BINTABLE_CLASSES = {cl.__name__: cl for cl in [
@@ -0,0 +1,79 @@
+"""
+This module contains Numba-compiled reductions of a binary table used by `BinTableLists`.
+
+Every function takes the table as a 2D `numpy.uint8` array ``data``
+and arrays ``rows`` and ``columns`` of `numpy.int64` indexes of rows and columns to reduce over.
+
+"""
+import numpy as np
+from numba import njit, prange
+
+
+@njit(cache=True, parallel=True, boundscheck=False)
+def all_per_row(data, rows, columns):
+    out = np.ones(len(rows), dtype=np.bool_)
+    for k in prange(len(rows)):
+        row_i = rows[k]
+        for col_i in columns:
+            if not data[row_i, col_i]:
+                out[k] = False
+                break
+    return out
+
+
+@njit(cache=True, parallel=True, boundscheck=False)
+def all_per_column(data, rows, columns):
+    out = np.ones(len(columns), dtype=np.bool_)
+    for k in prange(len(columns)):
+        col_i = columns[k]
+        for row_i in rows:
+            if not data[row_i, col_i]:
+                out[k] = False
+                break
+    return out
+
+
+@njit(cache=True, parallel=True, boundscheck=False)
+def any_per_row(data, rows, columns):
+    out = np.zeros(len(rows), dtype=np.bool_)
+    for k in prange(len(rows)):
+        row_i = rows[k]
+        for col_i in columns:
+            if data[row_i, col_i]:
+                out[k] = True
+                break
+    return out
+
+
+@njit(cache=True, parallel=True, boundscheck=False)
+def any_per_column(data, rows, columns):
+    out = np.zeros(len(columns), dtype=np.bool_)
+    for k in prange(len(columns)):
+        col_i = columns[k]
+        for row_i in rows:
+            if data[row_i, col_i]:
+                out[k] = True
+                break
+    return out
+
+
+@njit(cache=True, parallel=True, boundscheck=False)
+def sum_per_row(data, rows, columns):
+    out = np.zeros(len(rows), dtype=np.int64)
+    for k in prange(len(rows)):
+        row_i, s = rows[k], 0
+        for col_i in columns:
+            s += data[row_i, col_i]
+        out[k] = s
+    return out
+
+
+@njit(cache=True, parallel=True, boundscheck=False)
+def sum_per_column(data, rows, columns):
+    out = np.zeros(len(columns), dtype=np.int64)
+    for k in prange(len(columns)):
+        col_i, s = columns[k], 0
+        for row_i in rows:
+            s += data[row_i, col_i]
+        out[k] = s
+    return out
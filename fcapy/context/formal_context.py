@@ -11,7 +11,7 @@ from frozendict import frozendict
 import zlib
 
 from fcapy.context.bintable import init_bintable, BINTABLE_CLASSES, AbstractBinTable
-from fcapy.utils.utils import slice_list
+from fcapy.utils.utils import slice_list, bitset_to_indexes
 
 
 class FormalContext:
@@ -68,15 +68,28 @@ class FormalContext:
 
         """
         self._data = init_bintable(data, backend)
+        self._reset_caches()
         self.object_names = object_names
         self.attribute_names = attribute_names
         self.description = description
         self._target = target
 
+    def _reset_caches(self):
+        """Drop the values derived from the data and the names of the context. They are recomputed lazily"""
+        # Rows and columns of the data encoded as bitsets (python ints). Constructed lazily by ``_get_bitsets``
+        self._bitsets_per_axis = {}
+        # Decoded indexes of single columns (if axis = 0) and rows (if axis = 1). Filled lazily by ``_get_indexes``
+        self._indexes_per_axis = {0: {}, 1: {}}
+        self._hash = None  # Computed lazily by ``__hash__``
+        self._n_connections = None  # Computed lazily by ``n_connections`` property
+
     @property
     def data(self) -> AbstractBinTable:
         """Get or set the data with relations between objects and attributes (`list` of `list`)
 
+        The data should not be edited in place: the context caches the values derived from the data
+        (e.g. the bitsets of its rows and columns). Construct a new context from the edited data instead.
+
         Parameters
         ----------
         value : `list` of `list`
@@ -130,6 +143,7 @@ class FormalContext:
             self._object_names = value
 
         self._object_names_i_map = frozendict({name: idx for idx, name in enumerate(self._object_names)})
+        self._reset_caches()
 
     @property
     def attribute_names(self) -> List[str]:
@@ -170,6 +184,7 @@ class FormalContext:
             self._attribute_names = value
 
         self._attribute_names_i_map = {name: idx for idx, name in enumerate(self._attribute_names)}
+        self._reset_caches()
 
     @property
     def target(self):
@@ -180,6 +195,19 @@ class FormalContext:
     def backend(self) -> str:
         return type(self.data).__name__
 
+    def _get_bitsets(self, axis: int) -> List[int]:
+        """Return the columns (if ``axis`` = 0) or the rows (if ``axis`` = 1) of the data encoded as bitsets"""
+        if axis not in self._bitsets_per_axis:
+            self._bitsets_per_axis[axis] = self.data.to_bitsets(axis)
+        return self._bitsets_per_axis[axis]
+
+    def _get_indexes(self, axis: int, idx: int) -> Tuple[int, ...]:
+        """Return the indexes of True values in ``idx``-th column (if ``axis`` = 0) or row (if ``axis`` = 1)"""
+        indexes_cache = self._indexes_per_axis[axis]
+        if idx not in indexes_cache:
+            indexes_cache[idx] = tuple(bitset_to_indexes(self._get_bitsets(axis)[idx]))
+        return indexes_cache[idx]
+
     def extension_i(self, attribute_indexes: Collection[int], base_objects_i: Collection[int] = None) -> List[int]:
         """Return indexes of maximal set of objects which share given ``attribute_indexes``
 
@@ -198,9 +226,22 @@ class FormalContext:
         if len(attribute_indexes) == 0:
             return list(range(self.n_objects)) if base_objects_i is None else list(base_objects_i)
 
-        attribute_indexes = list(attribute_indexes)
+        if len(attribute_indexes) == 1 and base_objects_i is None:
+            # The most common query: the extension of a single attribute is a column of the data
+            return list(self._get_indexes(0, next(iter(attribute_indexes))))
+
+        # The extension is the bitwise AND of the columns of the given attributes. Stop as soon as it gets empty
+        columns_bitsets = self._get_bitsets(axis=0)
+        attributes_iterator = iter(attribute_indexes)
+        extension_bits = columns_bitsets[next(attributes_iterator)]
+        for m_i in attributes_iterator:
+            extension_bits &= columns_bitsets[m_i]
+            if not extension_bits:
+                break
 
-        return list(self.data.all_i(1, base_objects_i, attribute_indexes))
+        if base_objects_i is None:
+            return bitset_to_indexes(extension_bits)
+        return [g_i for g_i in base_objects_i if (extension_bits >> g_i) & 1]
 
     def extension_monotone_i(self, attribute_indexes: Collection[int], base_objects_i: Collection[int] = None)\
             -> List[int]:
@@ -268,8 +309,22 @@ class FormalContext:
         if len(object_indexes) == 0:
             return list(range(self.n_attributes)) if base_attrs_i is None else list(base_attrs_i)
 
-        object_indexes = list(object_indexes)
-        return list(self.data.all_i(0, object_indexes, base_attrs_i))
+        if len(object_indexes) == 1 and base_attrs_i is None:
+            # The intention of a single object is a row of the data
+            return list(self._get_indexes(1, next(iter(object_indexes))))
+
+        # The intention is the bitwise AND of the rows of the given objects. Stop as soon as it gets empty
+        rows_bitsets = self._get_bitsets(axis=1)
+        objects_iterator = iter(object_indexes)
+        intention_bits = rows_bitsets[next(objects_iterator)]
+        for g_i in objects_iterator:
+            intention_bits &= rows_bitsets[g_i]
+            if not intention_bits:
+                break
+
+        if base_attrs_i is None:
+            return bitset_to_indexes(intention_bits)
+        return [m_i for m_i in base_attrs_i if (intention_bits >> m_i) & 1]
 
     def intention_monotone_i(self, object_indexes: Iterable[int], base_attrs_i: Iterable[int] = None)\
             -> List[int]:
@@ -334,6 +389,13 @@ class FormalContext:
         """Get the size of the context (num. of objects and num. of attributes)"""
         return self.data.height, self.data.width
 
+    @property
+    def n_connections(self) -> int:
+        """Get the number of pairs (object, attribute) such that the object shares the attribute"""
+        if self._n_connections is None:
+            self._n_connections = int(self.data.sum())
+        return self._n_connections
+
     @property
     def description(self) -> str:
         """Get or set the human readable description of the context
@@ -493,7 +555,7 @@ class FormalContext:
     def __repr__(self):
         data_to_print = f'FormalContext ' +\
                         f'({self.n_objects} objects, {self.n_attributes} attributes, ' +\
-                        f'{self.data.sum()} connections)\n'
+                        f'{self.n_connections} connections)\n'
         data_to_print += self.print_data(max_n_objects=20, max_n_attributes=10)
         return data_to_print
 
@@ -515,39 +577,43 @@ class FormalContext:
             A string with the context data formatted as the table
 
         """
-        objs_to_print = list(self.object_names)
-        attrs_to_print = list(self.attribute_names)
-        data_to_print = self.data.to_list()
-        plot_objs_line = False
-
-        if self.n_attributes > max_n_attributes:
-            attrs_to_print = attrs_to_print[:max_n_attributes//2]\
-                             + ['...'] + attrs_to_print[-max_n_attributes//2:]
-            data_to_print = [line[:max_n_attributes//2]+['...']+line[-max_n_attributes//2:] for line in data_to_print]
-
-        if self.n_objects > max_n_objects:
-            objs_to_print = objs_to_print[:max_n_objects//2] + objs_to_print[-max_n_objects//2:]
-            data_to_print = data_to_print[:max_n_objects//2] + data_to_print[-max_n_objects//2:]
-            plot_objs_line = True
+        # Slicing of ranges takes O(1) time. So the indexes of the hidden objects and attributes are never listed
+        objs_i, attrs_i = range(self.n_objects), range(self.n_attributes)
+        plot_objs_line = self.n_objects > max_n_objects
+        plot_attrs_dots = self.n_attributes > max_n_attributes
+
+        if plot_attrs_dots:
+            attrs_i = [*attrs_i[:max_n_attributes//2], *attrs_i[-max_n_attributes//2:]]
+        if plot_objs_line:
+            objs_i = [*objs_i[:max_n_objects//2], *objs_i[-max_n_objects//2:]]
+        objs_i, attrs_i = list(objs_i), list(attrs_i)
+
+        # Only the printed part of the data is converted to lists
+        data_to_print = self.data[objs_i][:, attrs_i].to_list()
+        objs_to_print = [self.object_names[g_i] for g_i in objs_i]
+        attrs_to_print = [self.attribute_names[m_i] for m_i in attrs_i]
+        # The strings to print for False and True values of each attribute
+        cells_to_print = [(' ' * (len(m) - 1) + ' ', ' ' * (len(m) - 1) + 'X') for m in attrs_to_print]
+        if plot_attrs_dots:
+            attrs_to_print.insert(max_n_attributes//2, '...')
 
         max_obj_name_len = max([len(g) for g in objs_to_print])
 
         header = ' ' * max_obj_name_len + '|'
-        header += '|'.join([m for m in attrs_to_print])
+        header += '|'.join(attrs_to_print)
         header += '|'
 
         lines = []
-        for idx in range(len(data_to_print)):
-            g_name = objs_to_print[idx]
-            g_ms = data_to_print[idx]
-
+        for idx, (g_name, g_ms) in enumerate(zip(objs_to_print, data_to_print)):
             if plot_objs_line and idx == max_n_objects//2:
-                line = '.' * (max_obj_name_len + 1 + sum([len(m) + 1 for m in attrs_to_print]))
-                lines += [line] * 2
+                lines += ['.' * len(header)] * 2
+
+            cells = [cells[m_val] for cells, m_val in zip(cells_to_print, g_ms)]
+            if plot_attrs_dots:
+                cells.insert(max_n_attributes//2, '...')
 
             line = g_name + ' ' * (max_obj_name_len - len(g_name)) + '|'
-            line += '|'.join([(' ' * (len(m_name) - 1) + ('X' if m_val else ' ')) if m_val != '...' else '...'
-                              for m_name, m_val in zip(attrs_to_print, g_ms)])
+            line += '|'.join(cells)
             line += '|'
             lines.append(line)
 
@@ -598,15 +664,17 @@ class FormalContext:
         if use_indexes:
             return self.get_minimal_generators_i(intent, base_generator, base_objects)
 
-        intent_i = [m_i for m_i, m in enumerate(self.attribute_names) if m in intent]
+        def names_to_indexes(names, names_i_map):
+            return sorted({names_i_map[name] for name in names if name in names_i_map})
 
-        base_generator = list(base_generator) if base_generator is not None else []
-        base_generator = [m_i for m_i, m in enumerate(self.attribute_names) if m in base_generator]
+        intent_i = names_to_indexes(intent, self._attribute_names_i_map)
+        base_generator = names_to_indexes(base_generator, self._attribute_names_i_map)\
+            if base_generator is not None else []
 
         if base_objects is None:
             base_objects_i = list(range(self.n_objects))
         else:
-            base_objects_i = [g_i for g_i, g in enumerate(self._object_names) if g in base_objects]
+            base_objects_i = names_to_indexes(base_objects, self._object_names_i_map)
 
         min_gens = self.get_minimal_generators_i(intent_i, base_generator, base_objects_i)
 
@@ -661,7 +729,9 @@ class FormalContext:
         return is_not_equal
 
     def __hash__(self):
-        return hash((tuple(self._object_names), tuple(self._attribute_names), hash(self._data)))
+        if self._hash is None:
+            self._hash = hash((self._object_names, self._attribute_names, hash(self._data)))
+        return self._hash
 
     def __len__(self):
         return len(self.object_names)
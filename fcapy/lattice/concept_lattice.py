@@ -3,7 +3,7 @@ This module provides a ConceptLattice class. It may be considered as the main mo
 
 """
 import json
-
+from collections import deque
 from typing import Tuple, Union, Optional, List, Dict, Set, Collection
 
 from fcapy.algorithms import concept_construction as cca, lattice_construction as lca
@@ -237,6 +237,7 @@ class ConceptLattice(Lattice):
 
             ltc._elements = concepts_sorted
             ltc._elements_to_index_map = {el: idx for idx, el in enumerate(concepts_sorted)}
+            ltc._version += 1
             ltc._cache_leq = {}
             for cache_name in ['children', 'descendants', 'parents', 'ancestors']:
                 cache_name = f"_cache_{cache_name}"
@@ -511,7 +512,7 @@ class ConceptLattice(Lattice):
                     extent = concept_extents[concept_i][superconcept_i]
             return extent
 
-        concepts_to_visit = [self.top]
+        concepts_to_visit = deque([self.top])
         object_bottom_concepts = {idx: set() for idx in range(context.n_objects)}
         object_traced_concepts = {idx: set() for idx in range(context.n_objects)}
         visited_concepts = set()
@@ -520,7 +521,7 @@ class ConceptLattice(Lattice):
             if len(concepts_to_visit) == 0:
                 break
 
-            c_i = concepts_to_visit.pop(0)
+            c_i = concepts_to_visit.popleft()
             extent = stored_extension(c_i, use_generators)
             visited_concepts.add(c_i)
 
@@ -746,12 +747,22 @@ class ConceptLattice(Lattice):
         if path is not None:
             with open(path, 'r') as f:
                 json_data = f.read()
-        file_data = json.loads(json_data)
+        file_data = utils.json_loads(json_data)
         lattice_metadata, nodes_data, arcs_data = file_data
         top_concept_i = lattice_metadata['Top'][0]
         bottom_concept_i = lattice_metadata['Bottom'][0]
 
         is_pattern = 'PTypes' in nodes_data['Nodes'][0]['Int']
+        if not is_pattern:
+            # Decoded json keeps a separate copy of a name (and of the context hash) for each concept it appears in.
+            # So the copies are replaced by the shared objects to save the memory
+            shared_values = {}
+            for c_dict in nodes_data['Nodes']:
+                for c_part in [c_dict['Ext'], c_dict['Int']]:
+                    if isinstance(c_part, dict) and 'Names' in c_part:
+                        c_part['Names'] = [shared_values.setdefault(name, name) for name in c_part['Names']]
+                if 'Context_Hash' in c_dict:
+                    c_dict['Context_Hash'] = shared_values.setdefault(c_dict['Context_Hash'], c_dict['Context_Hash'])
 
         concepts = [
             PatternConcept.from_dict(c_dict, json_ready=True, pattern_types=pattern_types) if is_pattern else
@@ -799,10 +810,11 @@ class ConceptLattice(Lattice):
             "NodesCount": len(self), "ArcsCount": len(arcs)
         }
         if isinstance(self[0], PatternConcept):
-            to_dict_kwargs = dict(json_ready=True)
+            nodes_data = {"Nodes": [c.to_dict(json_ready=True) for c in self]}
         else:  # if FormalConcept
-            to_dict_kwargs = dict(objs_order=objs_order, attrs_order=attrs_order)
-        nodes_data = {"Nodes": [c.to_dict(**to_dict_kwargs) for c in self]}
+            # The orders of objects and attributes are shared by all the concepts. So they are computed only once
+            idx_maps = FormalConcept.build_index_maps(objs_order, attrs_order)
+            nodes_data = {"Nodes": [c.to_dict(objs_order, attrs_order, *idx_maps) for c in self]}
         arcs_data = {"Arcs": arcs}
         file_data = [lattice_metadata, nodes_data, arcs_data]
         json_data = json.dumps(file_data)
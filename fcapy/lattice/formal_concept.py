@@ -4,12 +4,17 @@ This module provides a class FormalConcept which represents the Formal Concept o
 """
 from abc import ABCMeta, abstractmethod
 import json
-from pydantic.dataclasses import dataclass
-from dataclasses import FrozenInstanceError
+from dataclasses import dataclass, field, FrozenInstanceError
 from typing import Dict, Container, FrozenSet, Any, List, Tuple
 from frozendict import frozendict
 
+from fcapy.utils.utils import indexes_to_bitset, json_loads
+
 JSON_BOTTOM_PLACEHOLDER = {"Inds": (-2,), "Names": ("BOTTOM_PLACEHOLDER",)}
+# The fields of a concept which cannot be updated after the concept is constructed
+_FROZEN_FIELDS = frozenset({'extent_i', 'extent', 'intent_i', 'intent', 'context_hash', 'is_monotone'})
+# The keys of a concept dictionary (see `FormalConcept.to_dict`) which are not the measures of the concept
+_DICT_RESERVED_KEYS = frozenset({'Ext', 'Int', 'Supp', 'Context_Hash', 'Monotone'})
 
 
 class UnmatchedContextError(ValueError):
@@ -28,30 +33,52 @@ class AbstractConcept(metaclass=ABCMeta):
     extent: Tuple[str, ...]  # Tuple of names of objects described by intent of the concept
     intent_i: Tuple[int, ...]  # Description of object indices from extent of the concept
     intent: Tuple[str, ...]  # Description of object names from extent of the concept
-    measures: Dict[str, float] = frozendict({})  # Dict with values of interestingness measures of the concept
+    measures: Dict[str, float] = field(default_factory=dict)  # Values of interestingness measures of the concept
     context_hash: int = None  # Hash value of a FormalContext the FormalConcept is based on
     is_monotone: bool = False  # "Bigger extent->bigger concept" if False else "smaller extent->bigger concept"
 
+    def __post_init__(self):
+        # Coerce the extent and the intent into tuples of indexes (int) and names (str).
+        # The values are put right into __dict__ to bypass the frozen fields check of __setattr__
+        fields_dict = self.__dict__
+        fields_dict['extent_i'] = tuple(map(int, fields_dict['extent_i']))
+        fields_dict['extent'] = tuple(map(str, fields_dict['extent']))
+        fields_dict['intent_i'] = tuple(map(int, fields_dict['intent_i']))
+        fields_dict['intent'] = tuple(map(str, fields_dict['intent']))
+        # Extent encoded as a bitset (python int) to compare the concepts. Computed lazily by ``extent_bits`` property
+        fields_dict['_extent_bits'] = None
+
     def __setattr__(self, key, value):
-        if key in self.__dict__ and key in {'extent_i', 'extent', 'intent_i', 'intent', 'context_hash', 'is_monotone'}:
+        if key in _FROZEN_FIELDS and key in self.__dict__:
             raise FrozenInstanceError(f'Value of {key} cannot be updated')
 
-        super(AbstractConcept, self).__setattr__(key, value)
+        object.__setattr__(self, key, value)
 
     @property
     def support(self):
         return len(self.extent_i)
 
-    def __eq__(self, other):
+    @property
+    def extent_bits(self) -> int:
+        """The extent encoded as a bitset: python int with the i-th bit set iff i is in ``extent_i``"""
+        if self._extent_bits is None:
+            self._extent_bits = indexes_to_bitset(self.extent_i)
+        return self._extent_bits
+
+    def _raise_incomparable(self, other: 'AbstractConcept'):
+        """Raise the error explaining why the concept cannot be compared with the ``other`` concept"""
         if self.context_hash != other.context_hash:
             raise UnmatchedContextError
+        raise UnmatchedMonotonicityError
 
-        if self.is_monotone != other.is_monotone:
-            raise UnmatchedMonotonicityError
+    def __eq__(self, other):
+        if self is other:
+            return True
 
-        if self.support != other.support:
-            return False
+        if self.context_hash != other.context_hash or self.is_monotone != other.is_monotone:
+            self._raise_incomparable(other)
 
+        # Tuples compare their lengths (i.e. supports) before the elements
         return self.extent_i == other.extent_i
 
     def __hash__(self):
@@ -59,32 +86,32 @@ class AbstractConcept(metaclass=ABCMeta):
 
     def __le__(self, other: 'AbstractConcept'):
         """A concept is smaller than the `other concept if its extent is a subset of extent of `other concept"""
-        if self.context_hash != other.context_hash:
-            raise UnmatchedContextError
+        if self is other:
+            return True
 
-        if self.is_monotone != other.is_monotone:
-            raise UnmatchedMonotonicityError
+        if self.context_hash != other.context_hash or self.is_monotone != other.is_monotone:
+            self._raise_incomparable(other)
 
         lesser, greater = (self, other) if not self.is_monotone else (other, self)
 
-        if lesser.support > greater.support:
+        if len(lesser.extent_i) > len(greater.extent_i):
             return False
-
-        greater_ext_i = set(greater.extent_i)
-        for g_i in lesser.extent_i:
-            if g_i not in greater_ext_i:
-                return False
-        return True
+        # The extent of the lesser concept is a subset of the greater one iff it has no bits outside the greater one
+        lesser_bits = lesser.extent_bits
+        return lesser_bits & greater.extent_bits == lesser_bits
 
     def __lt__(self, other: 'AbstractConcept'):
         """A concept is smaller than the `other concept if its extent is a subset of extent of `other concept"""
-        if self.support == other.support:  # i.e. they definitely not equal
+        if len(self.extent_i) == len(other.extent_i):  # i.e. they definitely not equal
             return False
 
         return self <= other
 
     @abstractmethod
-    def to_dict(self, objs_order: List[str], attrs_order: List[str]) -> Dict[str, Any]:
+    def to_dict(
+            self, objs_order: List[str], attrs_order: List[str],
+            obj_idx_map: Dict[str, int] = None, attr_idx_map: Dict[str, int] = None
+    ) -> Dict[str, Any]:
         ...
 
     @classmethod
@@ -112,7 +139,7 @@ class AbstractConcept(metaclass=ABCMeta):
         if path is not None:
             with open(path, 'r') as f:
                 json_data = f.read()
-        data = json.loads(json_data)
+        data = json_loads(json_data)
         c = cls.from_dict(data)
         return c
 
@@ -134,23 +161,36 @@ class FormalConcept(AbstractConcept):
     intent_i: Tuple[int, ...]  # Description of object indices from extent of the concept
     intent: Tuple[str, ...]  # Description of object names from extent of the concept
 
-    def to_dict(self, objs_order: List[str], attrs_order: List[str]) -> Dict[str, Any]:
-        """Convert FormalConcept into a dictionary"""
-        def sort_set(set_, key=None):
-            return tuple(sorted(set_, key=key))
+    @staticmethod
+    def build_index_maps(objs_order: List[str], attrs_order: List[str]) -> Tuple[frozendict, frozendict]:
+        """Return the maps from names of objects and attributes to their indexes in ``objs_order`` and ``attrs_order``
+
+        The maps can be computed once and passed to `to_dict` to convert many concepts (e.g. all concepts of a lattice)
+        """
+        obj_idx_map = frozendict(zip(objs_order, range(len(objs_order))))
+        attr_idx_map = frozendict(zip(attrs_order, range(len(attrs_order))))
+        return obj_idx_map, attr_idx_map
 
-        obj_idxs_map = {g: i for i, g in enumerate(objs_order)}
-        attrs_idxs_map = {m: i for i, m in enumerate(attrs_order)}
+    def to_dict(
+            self, objs_order: List[str], attrs_order: List[str],
+            obj_idx_map: Dict[str, int] = None, attr_idx_map: Dict[str, int] = None
+    ) -> Dict[str, Any]:
+        """Convert FormalConcept into a dictionary
+
+        Precomputed maps ``obj_idx_map`` and ``attr_idx_map`` from `build_index_maps` can be given to skip their building
+        """
+        if obj_idx_map is None or attr_idx_map is None:
+            obj_idx_map, attr_idx_map = self.build_index_maps(objs_order, attrs_order)
 
         concept_info = dict()
         concept_info['Ext'] = {
-            "Inds": sort_set(self.extent_i),
-            "Names": sort_set(self.extent, key=lambda g: obj_idxs_map[g]),
+            "Inds": tuple(sorted(self.extent_i)),
+            "Names": tuple(sorted(self.extent, key=obj_idx_map.__getitem__)),
             "Count": len(self.extent_i)
         }
         concept_info['Int'] = {
-            "Inds": sort_set(self.intent_i),
-            "Names": sort_set(self.intent, key=lambda m: attrs_idxs_map[m]),
+            "Inds": tuple(sorted(self.intent_i)),
+            "Names": tuple(sorted(self.intent, key=attr_idx_map.__getitem__)),
             "Count": len(self.intent_i)
         }
         concept_info['Supp'] = self.support
@@ -166,15 +206,12 @@ class FormalConcept(AbstractConcept):
         if data["Int"] == "BOTTOM":
             data["Int"] = JSON_BOTTOM_PLACEHOLDER
 
+        ext_data, int_data = data['Ext'], data['Int']
         c = FormalConcept(
-            data['Ext']['Inds'], data['Ext'].get('Names', []),
-            data['Int']['Inds'], data['Int'].get('Names', []),
+            ext_data['Inds'], ext_data.get('Names', ()),
+            int_data['Inds'], int_data.get('Names', ()),
+            measures={k: v for k, v in data.items() if k not in _DICT_RESERVED_KEYS},
             context_hash=data.get('Context_Hash'),
             is_monotone=data.get('Monotone', False)
         )
-
-        for k, v in data.items():
-            if k in ['Int', 'Ext']:
-                continue
-            c.measures[k] = v
         return c
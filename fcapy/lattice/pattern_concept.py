@@ -209,7 +209,7 @@ class PatternConcept:
             pattern_types = {pt.__name__: pt for pt in pattern_types} if pattern_types is not None else []
 
             int_dict = data['Int']
-            int_dict['PTypes'] = {k: getattr(PS, v) if v in dir(PS) else pattern_types[v] for k, v in
+            int_dict['PTypes'] = {k: getattr(PS, v) if hasattr(PS, v) else pattern_types[v] for k, v in
                                   int_dict['PTypes'].items()}
             int_dict['Inds'] = frozendict({int(k): int_dict['PTypes'][int_dict['AttrNames'][int(k)]].from_json(v)
                                            for k, v in int_dict['Inds'].items()})
@@ -7,6 +7,7 @@ from frozendict import frozendict
 import numpy as np
 from enum import Enum
 from copy import deepcopy
+from collections import deque
 
 from fcapy.mvcontext.mvcontext import MVContext
 from fcapy.lattice.pattern_concept import PatternConcept
@@ -321,9 +322,9 @@ class DecisionLatticePredictor:
 
         target = (trees_df['Gain'] * (trees_df['Feature'] == 'Leaf')).values
         leaf_nodes = trees_df.index[trees_df['Feature'] == 'Leaf'].values
-        parent_nodes = sorted(set(direct_parents[n_id] for n_id in leaf_nodes))
+        parent_nodes = deque(sorted(set(direct_parents[n_id] for n_id in leaf_nodes)))
         while len(parent_nodes) > 0:
-            n_id = parent_nodes.pop(0)
+            n_id = parent_nodes.popleft()
             if direct_parents[n_id] is not None:
                 parent_nodes.append(direct_parents[n_id])
 
@@ -68,13 +68,15 @@ class MVContext:
     def object_names(self, value):
         if value is None:
             self._object_names = [str(idx) for idx in range(self._n_objects)] if self._n_objects is not None else None
-            return
+        else:
+            assert len(value) == self._n_objects,\
+                'MVContext.object_names.setter: Length of new object names should match length of data'
+            assert all(type(name) == str for name in value),\
+                'MVContext.object_names.setter: Object names should be of type str'
+            self._object_names = value
 
-        assert len(value) == self._n_objects,\
-            'MVContext.object_names.setter: Length of new object names should match length of data'
-        assert all(type(name) == str for name in value),\
-            'MVContext.object_names.setter: Object names should be of type str'
-        self._object_names = value
+        self._object_names_i_map = frozendict({name: idx for idx, name in enumerate(self._object_names)})\
+            if self._object_names is not None else None
 
     @property
     def attribute_names(self):
@@ -102,6 +104,8 @@ class MVContext:
     @pattern_structures.setter
     def pattern_structures(self, value):
         self._pattern_structures = value
+        self._pattern_structures_i_map = frozendict({ps.name: ps_i for ps_i, ps in enumerate(value)})\
+            if value is not None else None
 
     @property
     def pattern_types(self):
@@ -200,22 +204,24 @@ class MVContext:
             A list of names of objects described by ``descriptions_i``
 
         """
-        ps_names_map = {ps.name: ps_i for ps_i, ps in enumerate(self._pattern_structures)}
-        descriptions_i = {ps_names_map[ps_name]: description for ps_name, description in descriptions.items()}
-        base_objects_i = {g_i for g_i, g in enumerate(self._object_names) if g in base_objects}\
-            if base_objects is not None else None
+        descriptions_i = {self._pattern_structures_i_map[ps_name]: description
+                          for ps_name, description in descriptions.items()}
+        base_objects_i = self._objects_to_indexes(base_objects) if base_objects is not None else None
         extension_i = self.extension_i(descriptions_i, base_objects_i=base_objects_i)
         objects = [self._object_names[g_i] for g_i in extension_i]
         return objects
 
     def intention(self, objects):
         """Return a common description of objects from ``objects``. Pat. structures are denoted by their names"""
-        objects = set(objects)
-        object_indexes = [g_i for g_i, g in enumerate(self._object_names) if g in objects]
+        object_indexes = self._objects_to_indexes(objects)
         descriptions_i = self.intention_i(object_indexes)
         description = {self._pattern_structures[ps_i].name: description for ps_i, description in descriptions_i.items()}
         return description
 
+    def _objects_to_indexes(self, objects):
+        """Return sorted indexes of ``objects`` skipping the names of objects the context does not have"""
+        return sorted({self._object_names_i_map[g] for g in objects if g in self._object_names_i_map})
+
     @property
     def n_objects(self):
         """Get the number of objects in the context (i.e. len(``MVContext.data``))"""
@@ -432,7 +438,7 @@ class MVContext:
         if base_objects is None:
             base_objects_i = None
         elif not use_indexes:
-            base_objects_i = [g_i for g_i, g in enumerate(self._object_names) if g in base_objects]
+            base_objects_i = self._objects_to_indexes(base_objects)
         else:
             base_objects_i = base_objects.copy()
 
@@ -9,6 +9,7 @@ from typing import List, Dict, Tuple, Callable, Any, FrozenSet, Optional, Collec
 from fcapy.utils.utils import slice_list
 from fcapy import LIB_INSTALLED
 from copy import copy, deepcopy
+from collections import deque
 
 
 class POSet:
@@ -56,6 +57,7 @@ class POSet:
             self._elements_to_index_map = {}
 
         self._leq_func = leq_func
+        self._version = 0
 
         self._use_cache = use_cache
         if self._use_cache:
@@ -90,6 +92,11 @@ class POSet:
         """A list of elements of the POSet"""
         return self._elements
 
+    @property
+    def version(self) -> int:
+        """A counter of changes of the POSet. It is increased every time an element is added, removed or replaced"""
+        return self._version
+
     @property
     def leq_func(self) -> Callable[[Any, Any], bool]:
         """A function to compare whether element ``a` from the POSet is smaller than ``b`` or not"""
@@ -435,6 +442,7 @@ class POSet:
     def __delitem__(self, key):
         del self._elements_to_index_map[self._elements[key]]
         del self._elements[key]
+        self._version += 1
 
         def decr_idx(idx, threshold):
             return idx - 1 if idx > threshold else idx
@@ -563,6 +571,7 @@ class POSet:
 
         self._elements.append(element)
         self._elements_to_index_map[element] = el_i_new
+        self._version += 1
 
     def remove(self, element: Any):
         """Remove an ``element`` from POSet"""
@@ -678,17 +687,21 @@ class POSet:
         """Get the sets of all the final and traced elements compared with ``element`` by ``compare_func``"""
         traced_elements, final_elements = set(), set()
 
-        elements_to_visit = [el_i for el_i in start_elements if compare_func(element, self._elements[el_i])]
+        elements_to_visit = deque(el_i for el_i in start_elements if compare_func(element, self._elements[el_i]))
+        # Every queued element is traced once visited. So the queued elements are both the traced and the ones to visit
+        elements_queued = set(elements_to_visit)
 
         while len(elements_to_visit) > 0:
-            el_i = elements_to_visit.pop(0)
+            el_i = elements_to_visit.popleft()
             traced_elements.add(el_i)
 
             next_elements = {el_i_next for el_i_next in next_elements_func(el_i)
                              if compare_func(element, self._elements[el_i_next])}
 
             if len(next_elements) > 0:
-                elements_to_visit += list(next_elements - traced_elements - set(elements_to_visit))
+                next_elements -= elements_queued
+                elements_to_visit.extend(next_elements)
+                elements_queued |= next_elements
             else:
                 final_elements.add(el_i)
 
@@ -788,3 +801,4 @@ class POSet:
         self._elements[idx] = new_element
         del self._elements_to_index_map[old_element]
         self._elements_to_index_map[new_element] = idx
+        self._version += 1
@@ -4,15 +4,23 @@ This module provides a set of functions which can be useful in any subpackage of
 """
 from itertools import chain, combinations
 from collections.abc import Iterable
+from functools import lru_cache
+from typing import FrozenSet
 import inspect
+import json
 
 from fcapy import LIB_INSTALLED
 if LIB_INSTALLED['tqdm']:
     from tqdm.notebook import tqdm
+if LIB_INSTALLED['numpy']:
+    import numpy as np
+if LIB_INSTALLED['orjson']:
+    import orjson
 
 
 def powerset(iterable):
     """powerset([1,2,3]) --> () (1,) (2,) (3,) (1,2) (1,3) (2,3) (1,2,3)"""
+    # `itertools.combinations` builds the subsets in C. It is much faster than iterating over bitmasks in python
     s = list(iterable)
     return chain.from_iterable(combinations(s, r) for r in range(len(s)+1))
 
@@ -23,7 +31,6 @@ def sparse_unique_columns(M):
     Sincerely copy-pasted from https://stackoverflow.com/questions/50419778/unique-column-of-a-sparse-matrix-in-python
     """
     import numpy as np
-    import scipy as sp
 
     M = M.tocsc()
     m, n = M.shape
@@ -33,7 +40,8 @@ def sparse_unique_columns(M):
         M.sum_duplicates()
     sizes = np.diff(M.indptr)
     idx = np.argsort(sizes)
-    Ms = M@sp.sparse.csc_matrix((np.ones((n,)), idx, np.arange(n+1)), (n, n))
+    # Reordering the columns by slicing is much faster than multiplying by a permutation matrix
+    Ms = M[:, idx]
     ssizes = np.diff(Ms.indptr)
     ssizes[1:] -= ssizes[:-1]
     grpidx, = np.where(ssizes)
@@ -57,11 +65,34 @@ def sparse_unique_columns(M):
         idx[gil:gir] = idx[gil:gir][idxi]
     counts = np.concatenate(counts)
     nu = counts.size - 1
-    uniques = M@sp.sparse.csc_matrix((np.ones((nu,)), idx[counts[:-1].cumsum()],
-                                   np.arange(nu + 1)), (n, nu))
+    uniques = M[:, idx[counts[:-1].cumsum()]].astype(float)
     return uniques, idx, counts[1:]
 
 
+def indexes_to_bitset(indexes) -> int:
+    """Encode a set of non-negative ``indexes`` as a bitset: python int with the i-th bit set iff i is in ``indexes``"""
+    bitset = 0
+    for i in indexes:
+        bitset |= 1 << int(i)
+    return bitset
+
+
+def bitset_to_indexes(bitset: int) -> list:
+    """Decode the ``bitset`` (python int) into the sorted list of indexes of its set bits"""
+    n_bits = bitset.bit_length()
+    if n_bits > 256 and LIB_INSTALLED['numpy']:
+        # Decode a long bitset without a python loop per bit: unpack the bytes of the bitset and locate the ones
+        bitset_bytes = np.frombuffer(bitset.to_bytes(-(-n_bits // 8), 'little'), dtype=np.uint8)
+        return np.flatnonzero(np.unpackbits(bitset_bytes, bitorder='little')).tolist()
+
+    indexes = []
+    while bitset:
+        lowest_bit = bitset & -bitset
+        indexes.append(lowest_bit.bit_length() - 1)
+        bitset ^= lowest_bit
+    return indexes
+
+
 def safe_tqdm(*args, **kwargs):
     """A decorator to used instead of basic tqdm. Does not raise any error if tqdm package is not installed"""
     if LIB_INSTALLED['tqdm']:
@@ -70,6 +101,19 @@ def safe_tqdm(*args, **kwargs):
         return args[0]
 
 
+def json_loads(json_data: str or bytes):
+    """Decode .json string ``json_data``. Use the fast `orjson` package if it is installed
+
+    `orjson` does not accept NaN and Infinity values. So `json` is used to decode the data containing them
+    """
+    if LIB_INSTALLED['orjson']:
+        try:
+            return orjson.loads(json_data)
+        except orjson.JSONDecodeError:
+            pass
+    return json.loads(json_data)
+
+
 def slice_list(lst: list, slicer):
     """Slice python list `lst` by any `slicer`"""
     if isinstance(slicer, slice):
@@ -81,9 +125,17 @@ def slice_list(lst: list, slicer):
     return lst
 
 
+@lru_cache(maxsize=1024)
+def _get_parameter_names(func, is_bound: bool) -> FrozenSet[str]:
+    """Return the names of parameters of `func` (skipping the first one if `func` is bound to an object)"""
+    params = list(inspect.signature(func).parameters)
+    return frozenset(params[1:] if is_bound else params)
+
+
 def get_kwargs_used(kwargs, func):
     """Return `kwargs` which are parameters of `func`"""
-    possible_kwargs = inspect.signature(func).parameters
+    # Bound methods are cached by their functions. So the cache does not keep the objects of the methods alive
+    possible_kwargs = _get_parameter_names(getattr(func, '__func__', func), hasattr(func, '__func__'))
     kwargs_used = {k: v for k, v in kwargs.items() if k in possible_kwargs}
     return kwargs_used
 
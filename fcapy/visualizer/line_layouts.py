@@ -13,18 +13,25 @@ from fcapy.poset import POSet
 def calc_levels(poset: POSet):
     """Return levels (y position) of nodes and dict with {`level`: `nodes`} mapping in a line diagram"""
     dsups_dict = poset.parents_dict
-
-    levels = [-1] * len(poset)
-    top_els = set(poset.tops)
-    nodes_to_visit = list(top_els)
-
-    while len(nodes_to_visit) > 0:
-        node_id = nodes_to_visit.pop(0)
-
-        levels[node_id] = max([levels[dsup_id] for dsup_id in dsups_dict[node_id]])+1 if node_id not in top_els else 0
-
-        nodes_to_visit += [n_i for n_i in poset.children(node_id)
-                           if levels[n_i] == -1 and all([levels[dsup_id] >= 0 for dsup_id in dsups_dict[n_i]])]
+    dsubs_dict = {el_i: [] for el_i in range(len(poset))}
+    for el_i, dsups in dsups_dict.items():
+        for dsup_i in dsups:
+            dsubs_dict[dsup_i].append(el_i)
+
+    # The level of a node is the length of the longest path to it from a top node.
+    # So the nodes are visited in topological order: a node is visited right after all its parents
+    levels = [0] * len(poset)
+    n_unvisited_dsups = [len(dsups_dict[el_i]) for el_i in range(len(poset))]
+    nodes_to_visit = [el_i for el_i, n_dsups in enumerate(n_unvisited_dsups) if n_dsups == 0]
+    while nodes_to_visit:
+        node_id = nodes_to_visit.pop()
+        node_level = levels[node_id] + 1
+        for dsub_id in dsubs_dict[node_id]:
+            if levels[dsub_id] < node_level:
+                levels[dsub_id] = node_level
+            n_unvisited_dsups[dsub_id] -= 1
+            if n_unvisited_dsups[dsub_id] == 0:
+                nodes_to_visit.append(dsub_id)
 
     levels_dict = {i: [] for i in range(max(levels) + 1)}
     for c_i in range(len(poset)):
@@ -62,6 +69,8 @@ def fcart_layout(poset, c=0.5, dpth=1):
 
     """
     c_levels, levels_dict = calc_levels(poset)
+    parents_dict = poset.parents_dict
+    lvl_sizes = [len(levels_dict[lvl]) for lvl in range(len(levels_dict))]
     id_on_lvl = [0] * len(poset)
 
     for lvl, elems in levels_dict.items():
@@ -69,15 +78,17 @@ def fcart_layout(poset, c=0.5, dpth=1):
             priority = []
             for elem in elems:
                 mp = 0
-                for par in poset.parents(elem):
-                    if c_levels[elem] - c_levels[par] <= dpth:
-                        mp += c ** (c_levels[elem] - c_levels[par] - 1) * id_on_lvl[par] / len(levels_dict[c_levels[par]])
-                priority += [mp / len(poset.parents(elem))]
+                elem_lvl, parents = c_levels[elem], parents_dict[elem]
+                for par in parents:
+                    lvl_diff = elem_lvl - c_levels[par]
+                    if lvl_diff <= dpth:
+                        mp += c ** (lvl_diff - 1) * id_on_lvl[par] / lvl_sizes[c_levels[par]]
+                priority.append(mp / len(parents))
             elems = [x for _, x in sorted(zip(priority, elems))]
         for i, elem in enumerate(elems):
-            id_on_lvl[elem] = i;
+            id_on_lvl[elem] = i
 
-    x_pos = [2 * (id_on_lvl[i] + 1) / (len(levels_dict[c_levels[i]]) + 1) - 1 for i in range(len(c_levels))]
+    x_pos = [2 * (id_on_lvl[i] + 1) / (lvl_sizes[c_levels[i]] + 1) - 1 for i in range(len(c_levels))]
     y_pos = [-2 * c_levels[i] / len(levels_dict) + 1 for i in range(len(c_levels))]
 
     pos = {i : [x_pos[i], y_pos[i]] for i in range(len(c_levels))}
@@ -11,7 +11,8 @@ from fcapy.lattice import ConceptLattice
 import networkx as nx
 
 from typing import Tuple, Callable, Dict, Iterable
-from attr import dataclass
+from heapq import nsmallest
+from attr import dataclass, ib
 
 import logging
 import warnings
@@ -96,6 +97,9 @@ class AbstractLineViz:
     flg_axes: bool = False
     flg_drop_bottom_concept: bool = False
 
+    # The last drawn poset converted to networkx graph. Kept as a triple (poset, version of the poset, graph)
+    _graph_cache: Tuple = ib(default=None, init=False, repr=False, eq=False)
+
     #####################
     # Functions         #
     #####################
@@ -116,9 +120,9 @@ class AbstractLineViz:
     def draw_concept_lattice(self, lattice: ConceptLattice, **kwargs):
         """Draw `lattice` via `draw_poset` function with node labels generated by `concept_lattice_label_func` """
         if 'node_label_func' not in kwargs:
-            kwargs['node_label_func'] = lambda c_i, L: self.concept_lattice_label_func(
-                c_i, L, **kw_used(kwargs, self.concept_lattice_label_func)
-            )
+            # The parameters of the labels are the same for every node. So they are selected from kwargs only once
+            label_kwargs = kw_used(kwargs, self.concept_lattice_label_func)
+            kwargs['node_label_func'] = lambda c_i, L: self.concept_lattice_label_func(c_i, L, **label_kwargs)
         # Temporary solution to drop the bottom concept of a `lattice`
         # if it does not contain any objects and, therefore, any new intent
         flg_name = 'flg_drop_empty_bottom'
@@ -167,7 +171,8 @@ class AbstractLineViz:
         # draw only the edges for the drawn nodes. If other is not specified
         if edgelist is None:
             edgelist = list(G.edges)
-        edgelist = [e for e in edgelist if all([v in nodelist for v in e[:2]])]
+        nodeset = frozenset(nodelist)
+        edgelist = [e for e in edgelist if e[0] in nodeset and e[1] in nodeset]
 
         return nodelist, edgelist
 
@@ -188,12 +193,11 @@ class AbstractLineViz:
         where m_i are attributes of concept intent, and g_i are objects of concept extent
         """
         def short_set_repr(set_: set, flg_count_prefix: bool, max_count: int) -> str:
-            if len(set_) > 0:
-                s = f"{len(set_)}: " if flg_count_prefix else ""
-                s += ', '.join(sorted(set_)[:max_count])
-            else:
-                s = ''
-            return s
+            if len(set_) == 0:
+                return ''
+            # Only the first ``max_count`` elements are shown (all if it is None). So the whole set is rarely sorted
+            prefix = f"{len(set_)}: " if flg_count_prefix else ""
+            return prefix + ', '.join(sorted(set_) if max_count is None else nsmallest(max_count, set_))
 
         new_intent_str = short_set_repr(lattice.get_concept_new_intent(c_i),
                                         flg_new_intent_count_prefix, max_new_intent_count)
@@ -205,7 +209,7 @@ class AbstractLineViz:
 
     def _retrieve_nodelist_edgelist(self, poset, kwargs):
         """Return nodelist and edgelist to be drawn (either default ones or specified with kwargs)"""
-        G = poset.to_networkx('down')
+        G = self._get_networkx_graph(poset)
         nodelist, edgelist = self._filter_nodes_edges(G, **kw_used(kwargs, self._filter_nodes_edges))
         for k in ['nodelist', 'edgelist']:
             if k in kwargs:
@@ -213,6 +217,16 @@ class AbstractLineViz:
 
         return G, nodelist, edgelist
 
+    def _get_networkx_graph(self, poset: POSet) -> nx.DiGraph:
+        """Return ``poset`` converted to networkx graph. The graph is reused while the same poset is drawn
+
+        The graph is rebuilt whenever the ``version`` of the poset changes.
+        The returned graph is shared between the calls. So it should not be modified
+        """
+        if self._graph_cache is None or self._graph_cache[0] is not poset or self._graph_cache[1] != poset.version:
+            self._graph_cache = (poset, poset.version, poset.to_networkx('down'))
+        return self._graph_cache[2]
+
     def _retrieve_pos(self, poset, kwargs, nodelist, edgelist):
         """Return the nodes positions to be drawn (either default ones or specified with kwargs)"""
         if 'pos' in kwargs:
@@ -387,22 +401,28 @@ class LineVizNx(AbstractLineViz):
 
         # multiedges = list(set([el for i, el in enumerate(edgelist) if el in edgelist[i + 1:]]))
 
-        for edge, labels in edge_labels_map.items():
-            if len(labels) % 2 == 0:
-                r_func = lambda i: (i // 2 + 1) * ((-1) ** (i % 2))
-            else:
-                r_func = lambda i: ((i - 1) // 2 + 1) * ((-1) ** (i % 2 + 1))
+        if is_edge_color_specific:
+            edge_lbl_idx_map = {}
+            for edge_lbl_i, edge_lbl in enumerate(edges):
+                edge_lbl_idx_map.setdefault(tuple(edge_lbl), edge_lbl_i)
 
+        # The edges are drawn in batches: one batch per each radius of the arcs
+        edges_per_radius = {}
+        for edge, labels in edge_labels_map.items():
+            is_even = len(labels) % 2 == 0
             for i, label in enumerate(labels):
                 if is_edge_color_specific:
-                    edge_lbl = (edge[1], edge[0], label)
-                    edge_lbl_i = edges.index(edge_lbl)
-                    edge_color_ = edge_color[edge_lbl_i]
+                    edge_color_ = edge_color[edge_lbl_idx_map[(edge[1], edge[0], label)]]
                 else:
                     edge_color_ = edge_color
 
-                r = r_func(i)
-                self._draw_edges(G, pos, ax, [edge], edge_radius=r*0.1, edge_color=[edge_color_])
+                r = (i // 2 + 1) * ((-1) ** (i % 2)) if is_even else ((i - 1) // 2 + 1) * ((-1) ** (i % 2 + 1))
+                edges_radius, colors_radius = edges_per_radius.setdefault(r, ([], []))
+                edges_radius.append(edge)
+                colors_radius.append(edge_color_)
+
+        for r, (edges_radius, colors_radius) in edges_per_radius.items():
+            self._draw_edges(G, pos, ax, edges_radius, edge_radius=r*0.1, edge_color=colors_radius)
 
         nx.draw_networkx_edge_labels(
             G, pos,
@@ -439,9 +459,12 @@ class LineVizNx(AbstractLineViz):
             for pname in ['node_color', 'node_shape', 'node_size']
         ]
 
-        for color, shape in set(zip(node_color, node_shape)):
-            nlist = [node_i for (node_i, clr, shp) in zip(nodelist, node_color, node_shape)
-                     if clr == color and shp == shape]
+        # Group the nodes by their style in one pass. So every group is drawn with a single networkx call
+        nodes_per_style = {}
+        for node_i, clr, shp in zip(nodelist, node_color, node_shape):
+            nodes_per_style.setdefault((clr, shp), []).append(node_i)
+
+        for (color, shape), nlist in nodes_per_style.items():
             sizes = [node_size[i] for i in nlist]
 
             nx.draw_networkx_nodes(
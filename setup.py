@@ -19,10 +19,10 @@ def run_install(**kwargs):
         'lattice': [
             'ipywidgets',
             'tqdm',
-            'pydantic',
         ],
         'algorithms': [
             'joblib',
+            'numba',
             'scikit-learn',
             'tqdm',
         ],
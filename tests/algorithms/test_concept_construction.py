@@ -9,6 +9,7 @@ from fcapy.lattice.pattern_concept import PatternConcept
 from fcapy.lattice import ConceptLattice
 from fcapy.mvcontext import pattern_structure as PS, mvcontext
 from fcapy.ml import decision_lattice as DL
+from fcapy import LIB_INSTALLED
 
 import numpy as np
 from sklearn.datasets import load_iris
@@ -49,6 +50,25 @@ def test_close_by_one():
     assert set(concepts_constructed) == set(concepts_constructed_iterauto), \
         "Close_by_one failed. Iterations over extents and automatically chosen set give different set of concepts"
 
+    closure_cache = {}
+    concepts_cached = cca.close_by_one(context, iterate_extents=True, closure_cache=closure_cache)
+    assert len(closure_cache) > 0, "Close_by_one failed. Closure cache is not filled up"
+    concepts_cached_rerun = cca.close_by_one(context, iterate_extents=True, closure_cache=closure_cache)
+    assert set(concepts_cached) == set(concepts_cached_rerun) == set(concepts_constructed),\
+        "Close_by_one failed. Memoized closures give different set of concepts"
+
+    flg_numba = LIB_INSTALLED['numba']
+    concepts_per_flag = {}
+    initial_combinations = [[], [0]]
+    for flg in [False, flg_numba]:
+        LIB_INSTALLED['numba'] = flg
+        concepts_per_flag[flg] = cca.close_by_one(
+            context, iterate_extents=False, initial_combinations=initial_combinations)
+    LIB_INSTALLED['numba'] = flg_numba
+    assert initial_combinations == [[], [0]], "Close_by_one failed. Initial combinations should not be modified"
+    assert concepts_per_flag[False] == concepts_per_flag[flg_numba],\
+        "Close_by_one failed. Compiled and pure python versions give different concepts"
+
     data = [[1], [2]]
     object_names = ['a', 'b']
     attribute_names = ['M1']
@@ -134,6 +154,14 @@ def test_sofia_general():
         'sofia_general failed. Sofia algorithm does not produce the subset of stable concepts'
 
 
+def test_sofia_general_measures():
+    # On this context the measures are computed on smaller projections only. Not on the whole context
+    K = FormalContext(data=(np.random.default_rng(1).random((30, 10)) < 0.4).tolist())
+    L = cca.sofia_general(K, 8)
+    assert all(len(c.measures) == 0 for c in L),\
+        'sofia_general failed. The concepts should not keep the measures computed on the projections of the context'
+
+
 def test_parse_decision_tree_to_extents():
     iris_data = load_iris()
     X = iris_data['data']
@@ -142,7 +170,8 @@ def test_parse_decision_tree_to_extents():
     dt = DecisionTreeClassifier()
     dt.fit(X, Y)
     extents = cca.parse_decision_tree_to_extents(dt, X, n_jobs=1)
-    extents_par = cca.parse_decision_tree_to_extents(dt, X, n_jobs=2)
+    with pytest.warns(DeprecationWarning):
+        extents_par = cca.parse_decision_tree_to_extents(dt, X, n_jobs=2)
     assert set([tuple(sorted(ext_)) for ext_ in extents]) == set([tuple(sorted(ext_)) for ext_ in extents_par])
 
 
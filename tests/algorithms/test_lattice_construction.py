@@ -4,6 +4,7 @@ from fcapy.algorithms import lattice_construction as lca, concept_construction a
 from fcapy.lattice import ConceptLattice
 from fcapy.context import read_cxt, read_csv
 import numpy as np
+from fcapy import LIB_INSTALLED
 
 
 def test_complete_comparison():
@@ -27,6 +28,19 @@ def test_complete_comparison():
     assert subconcepts_dict == subconcepts_dict_parallel,\
         "Complete_comparison failed. Parallel constructed subconcepts differ from non parallel ones"
 
+    concepts = list(ConceptLattice.from_context(read_cxt('data/animal_movement.cxt')))
+    concepts_monotone = [FormalConcept(c.intent_i, c.intent, c.extent_i, c.extent, is_monotone=True)
+                         for c in concepts]
+    flg_numpy = LIB_INSTALLED['numpy']
+    for concepts_ in [concepts, concepts_monotone]:
+        subconcepts_dicts = {}
+        for flg in [False, flg_numpy]:
+            LIB_INSTALLED['numpy'] = flg
+            subconcepts_dicts[flg] = lca.complete_comparison(concepts_)
+        LIB_INSTALLED['numpy'] = flg_numpy
+        assert subconcepts_dicts[False] == subconcepts_dicts[flg_numpy],\
+            "Complete_comparison failed. Comparison of packed extents differs from the comparison of concepts"
+
 
 def test_spanning_tree():
     ctx = read_cxt('data/animal_movement.cxt')
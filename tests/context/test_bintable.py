@@ -3,6 +3,7 @@ import numpy as np
 from fcapy.context import bintable as btables
 from fcapy.context import bintable_errors as berrors
 from .data_to_test import animal_movement_data
+from fcapy import LIB_INSTALLED
 
 
 def test_abstract_class():
@@ -32,6 +33,10 @@ def test_init(animal_movement_data):
         with pytest.raises(berrors.UnmatchedLengthError):
             BTClass([[True, True], [False, ]])
 
+    with pytest.raises(berrors.NotBooleanValueError) as excinfo:
+        btables.BinTableLists([[True, False], [True, 1]])
+    assert excinfo.value.row_idx == 1, 'BinTableLists._validate_data failed. Wrong index of a non boolean row'
+
 
 def test_to_lists():
     data = [[False, True, True], [False, False, True], [False, False, True]]
@@ -49,6 +54,17 @@ def test_to_tuples():
         assert bt.to_tuple() == tuple([tuple(row) for row in data])
 
 
+def test_to_bitsets():
+    data = [[False, True, True], [False, False, True], [False, False, True]]
+
+    for BTClass in btables.BINTABLE_CLASSES.values():
+        bt = BTClass(data)
+        assert bt.to_bitsets(axis=1) == [0b110, 0b100, 0b100]
+        assert bt.to_bitsets(axis=0) == [0b000, 0b001, 0b111]
+        with pytest.raises(ValueError):
+            bt.to_bitsets(axis=2)
+
+
 def test_hash():
     data = [[False, True, True], [False, False, True], [False, False, True]]
 
@@ -60,6 +76,9 @@ def test_hash():
         set_small = {bt1, bt2}
         assert set_big == set_small, 'BinTable.__hash__ failed'
 
+        bt3.data = data[:-1]
+        assert hash(bt3) == hash(bt2), 'BinTable.__hash__ failed. The cached hash is not reset when the data is updated'
+
 
 def test_all():
     data = [[False, False], [False, True], [True, True]]
@@ -130,6 +149,51 @@ def test_sum():
         with pytest.raises(berrors.UnknownAxisError):
             bt.sum(42)
 
+    data_np = np.arange(4*11).reshape(4, 11) % 3 == 0
+    for BTClass in btables.BINTABLE_CLASSES.values():
+        bt = BTClass(data_np.tolist())
+        assert list(bt.sum(0)) == list(data_np.sum(0))
+        assert list(bt.sum(0, rows=[1, 3], columns=[10, 0, 9])) == list(data_np[[1, 3]][:, [10, 0, 9]].sum(0))
+
+
+def test_bintable_lists_numba():
+    data_np = np.arange(5*7).reshape(5, 7) % 3 != 1
+    rows, columns = [4, 0, 2], [6, 1, 5]
+    data_slice = data_np[rows][:, columns]
+
+    flg_numba = LIB_INSTALLED['numba']
+    for flg in [False, flg_numba]:
+        LIB_INSTALLED['numba'] = flg
+        bt = btables.BinTableLists(data_np.tolist())
+        for ax in [0, 1]:
+            assert list(bt.all(ax)) == list(data_np.all(ax))
+            assert list(bt.any(ax)) == list(data_np.any(ax))
+            assert list(bt.sum(ax)) == list(data_np.sum(ax))
+            assert list(bt.all(ax, rows, columns)) == list(data_slice.all(ax))
+            assert list(bt.any(ax, rows, columns)) == list(data_slice.any(ax))
+            assert list(bt.sum(ax, rows, columns)) == list(data_slice.sum(ax))
+    LIB_INSTALLED['numba'] = flg_numba
+
+
+def test_bintable_lists_data_replaced():
+    bt = btables.BinTableLists([[False, False], [False, False], [False, False]])
+    assert list(bt.sum(0)) == [0, 0]
+
+    bt.data = [[True, False], [False, False], [False, False]]
+    assert list(bt.any(1)) == [True, False, False]
+    assert list(bt.sum(0)) == [1, 0]
+
+
+def test_bintable_numpy_readonly():
+    data = np.zeros((3, 2), dtype=bool)
+    bt = btables.BinTableNumpy(data)
+    with pytest.raises(ValueError):
+        bt.data[0, 0] = True
+    assert list(bt.any(1)) == [False, False, False] and bt.sum() == 0
+
+    data[0, 0] = True  # The array passed by the user should stay writeable
+    assert data.flags.writeable
+
 
 def test_interchangeability():
     data = [[False, False], [False, True], [True, True]]
@@ -165,6 +229,10 @@ def test_getitem():
         output = bt[:, 0]
         assert tuple(output) == tuple([row[0] for row in data]), f"{BTClass}.__getitem__ failed"
 
+        # Slices skip the validation of their data. But the data set later should still be validated
+        with pytest.raises(berrors.NotBooleanValueError):
+            bt[:1].data = [[1, False], [True, True]]
+
 
 def test_and():
     data1 = [[False, True, True], [False, False, True], [False, False, True]]
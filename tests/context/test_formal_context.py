@@ -56,6 +56,15 @@ def test_intent_extent_i(animal_movement_data):
     assert ctx.extension_i([]) == list(range(ctx.n_objects))
     assert ctx.intention_i([]) == list(range(ctx.n_attributes))
 
+    for m_i in range(ctx.n_attributes):
+        ext_single = ctx.extension_i([m_i])
+        ext_single.append(-1)  # The output should not be linked to the cached indexes
+        assert ctx.extension_i([m_i]) == [g_i for g_i, row in enumerate(data) if row[m_i]],\
+            'FormalContext.extension_i failed. Wrong extension of a single attribute'
+    for g_i in range(ctx.n_objects):
+        assert ctx.intention_i([g_i]) == [m_i for m_i, v in enumerate(data[g_i]) if v],\
+            'FormalContext.intention_i failed. Wrong intention of a single object'
+
 
 def test_intent_extent_i_monotone(animal_movement_data):
     data = animal_movement_data['data']
@@ -137,6 +146,16 @@ def test_n_attributes(animal_movement_data):
         ctx.n_attributes = 42
 
 
+def test_n_connections(animal_movement_data):
+    data = animal_movement_data['data']
+    ctx = FormalContext(data=data)
+    assert ctx.n_connections == sum([sum(row) for row in data]),\
+        'FormalContext.n_connections failed. Should be the number of True values in data'
+
+    with pytest.raises(AttributeError):
+        ctx.n_connections = 42
+
+
 def test_description():
     ctx = FormalContext()
     ctx.description = 'Test description'
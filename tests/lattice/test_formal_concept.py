@@ -1,3 +1,4 @@
+import dataclasses
 import pytest
 from fcapy.lattice.formal_concept import FormalConcept, UnmatchedMonotonicityError, UnmatchedContextError
 
@@ -14,6 +15,10 @@ def test_formal_concept_init():
     assert c.extent == ('a', 'b')
     assert c.intent == ('4', '5')
 
+    c_other = FormalConcept([1, 2], ["a", "b"], [4, 5], [4, 5])
+    c.measures['Supp'] = 2
+    assert c_other.measures == {}, 'FormalConcept.__init__ failed. Each concept should have its own measures dict'
+
 
 def test_formal_concept_extent_intent():
     c = FormalConcept([1, 2], ['a', 'b'], [4, 5], ["d", "e"])
@@ -85,6 +90,14 @@ def test__le__lt__():
     with pytest.raises(UnmatchedMonotonicityError):
         c1 <= c6
 
+    assert c1.extent_bits == 0b1110, "FormalConcept.extent_bits failed. Wrong extent bitset is computed"
+    with pytest.raises(AttributeError):
+        c1.extent_bits = 0b110
+    assert '_extent_bits' not in {f.name for f in dataclasses.fields(c1)},\
+        "FormalConcept failed. The cached extent bitset should not be a field of the dataclass"
+    with pytest.raises(TypeError):
+        FormalConcept([1, 2], ['a', 'b'], [4, 5], ['d', 'e'], extent_bits=0b110)
+
 
 def test__hash__():
     c1 = FormalConcept([1, 2], ['a', 'b'], [4, 5], ['d', 'e'])
@@ -106,6 +119,10 @@ def test_dict_converter():
     c1_dict = c1.to_dict(G, M)
     assert FormalConcept.from_dict(c1_dict).to_dict(G, M) == c1_dict,\
         "FormalConcept.to/from_dict failed. Dict does not contain concept measures"
+    assert c1.to_dict(G, M, *FormalConcept.build_index_maps(G, M)) == c1_dict,\
+        "FormalConcept.to_dict failed. Precomputed index maps should give the same dict"
+    assert FormalConcept.from_dict(c1_dict).measures == {'LStab': 0.5},\
+        "FormalConcept.from_dict failed. Only the concept measures should be loaded into the measures dict"
 
 
 def test_json_converter():
@@ -620,3 +620,16 @@ def test_to_networkx():
     with pytest.raises(ModuleNotFoundError):
         s.to_networkx('down')
     LIB_INSTALLED['networkx'] = True
+
+
+def test_version():
+    leq_func = lambda x, y: set(x) & set(y) == set(x)
+    s = POSet(['', 'a', 'ab'], leq_func)
+    versions = [s.version]
+    s.add('b')
+    versions.append(s.version)
+    s.remove('a')
+    versions.append(s.version)
+    s._update_element('b', 'c')
+    versions.append(s.version)
+    assert versions == sorted(set(versions)), 'POSet.version failed. Every change of the poset should increase it'
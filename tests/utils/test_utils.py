@@ -1,3 +1,6 @@
+import json
+import math
+
 from fcapy.utils import utils
 from fcapy import LIB_INSTALLED
 
@@ -7,6 +10,11 @@ def test_powerset():
     ps_true = {(), (1,), (2,), (3,), (1, 2), (1, 3), (2, 3), (1, 2, 3)}
     assert ps == ps_true, 'utils.powerset failed. Powerset does not give the expected result'
 
+    ps = list(utils.powerset('abc'))
+    assert ps == [(), ('a',), ('b',), ('c',), ('a', 'b'), ('a', 'c'), ('b', 'c'), ('a', 'b', 'c')],\
+        'utils.powerset failed. The subsets should be ordered by their size'
+    assert len(list(utils.powerset(range(10)))) == 2**10
+
 
 def test_sparse_unique_columns():
     import scipy as sp
@@ -32,6 +40,19 @@ def test_sparse_unique_columns():
     assert (counts == counts_true).mean() == 1, 'utils.sparse_unique_columns failed'
 
 
+def test_indexes_to_bitset():
+    assert utils.indexes_to_bitset([]) == 0
+    assert utils.indexes_to_bitset([0, 2, 3]) == 0b1101
+    assert utils.indexes_to_bitset(range(70)) == 2**70 - 1
+
+
+def test_bitset_to_indexes():
+    assert utils.bitset_to_indexes(0) == []
+    assert utils.bitset_to_indexes(0b1101) == [0, 2, 3]
+    assert utils.bitset_to_indexes(2**70 + 1) == [0, 70]
+    assert utils.bitset_to_indexes(2**1000 + 2**300 + 8) == [3, 300, 1000]
+
+
 def test_safe_tqdm():
     flg_true = LIB_INSTALLED['tqdm']
     for flg in [False, True]:
@@ -39,3 +60,37 @@ def test_safe_tqdm():
         for i in utils.safe_tqdm(range(100)):
             pass
     LIB_INSTALLED['tqdm'] = flg_true
+
+
+def test_json_loads():
+    data = [{'Ext': {'Inds': [0, 2], 'Names': ['a', 'c']}, 'Int': {'1': 'x'}}, [1.5, None]]
+    data_nonfinite = {'nan': float('nan'), 'inf': [float('inf'), -float('inf')]}
+
+    flg_orjson = LIB_INSTALLED['orjson']
+    for flg in [False, flg_orjson]:
+        LIB_INSTALLED['orjson'] = flg
+        assert utils.json_loads(json.dumps(data)) == data
+
+        data_decoded = utils.json_loads(json.dumps(data_nonfinite))
+        assert math.isnan(data_decoded['nan']) and data_decoded['inf'] == [float('inf'), -float('inf')]
+    LIB_INSTALLED['orjson'] = flg_orjson
+
+
+def test_get_kwargs_used():
+    class A:
+        def f(self, a, b=1):
+            pass
+
+        @classmethod
+        def g(cls, a, c=1):
+            pass
+
+    def h(a, d=1):
+        pass
+
+    kwargs = {'self': 0, 'cls': 0, 'a': 1, 'b': 2, 'c': 3, 'd': 4}
+    assert utils.get_kwargs_used(kwargs, A().f) == {'a': 1, 'b': 2}
+    assert utils.get_kwargs_used(kwargs, A.f) == {'self': 0, 'a': 1, 'b': 2}
+    assert utils.get_kwargs_used(kwargs, A.g) == {'a': 1, 'c': 3}
+    assert utils.get_kwargs_used(kwargs, h) == {'a': 1, 'd': 4}
+    assert utils.get_kwargs_used(kwargs, h) == {'a': 1, 'd': 4}, 'The cached result should be the same'
@@ -2,17 +2,85 @@ import fcapy.visualizer.mover
 from fcapy.visualizer import line_visualizers as viz, line_layouts, mover
 from fcapy.context import FormalContext
 from fcapy.lattice.concept_lattice import ConceptLattice
+from fcapy.poset import POSet
 
 
-import io
+from functools import lru_cache
+from types import SimpleNamespace
 import numpy as np
+import matplotlib
+matplotlib.use('Agg')  # The figures are only rendered into buffers. So there is no need in interactive backend
 import matplotlib.pyplot as plt
-from matplotlib import image
+from PIL import Image
 import networkx as nx
 
 import pytest
 
 
+# The dpi to render the figures compared with the reference images (stored in data/ folder) at
+COMPARE_DPI = 100
+
+
+def fig_to_rgba(fig) -> np.ndarray:
+    """Render the figure ``fig`` and return its pixels as an array of RGBA uint8 values"""
+    fig.canvas.draw()
+    return np.asarray(fig.canvas.buffer_rgba())
+
+
+@lru_cache(maxsize=None)
+def load_reference_rgba(fname) -> np.ndarray:
+    """Load the reference .png image ``fname`` as an array of RGBA uint8 values (decoded once per session)"""
+    with Image.open(fname) as im:
+        return np.asarray(im.convert('RGBA'))
+
+
+def is_image_close(im_a: np.ndarray, im_b: np.ndarray, atol: int = 3, n_tile_rows: int = 128) -> bool:
+    """Check if uint8 images differ by less than ``atol`` in every value. Stop on the first tile of rows that differs"""
+    if im_a.shape != im_b.shape:
+        return False
+
+    for row_i in range(0, len(im_a), n_tile_rows):
+        tile_a, tile_b = im_a[row_i:row_i + n_tile_rows], im_b[row_i:row_i + n_tile_rows]
+        if np.abs(tile_a.astype(np.int16) - tile_b).max() >= atol:
+            return False
+    return True
+
+
+@pytest.fixture(scope='module')
+def animal_movement_lattice():
+    """The lattice of animal_movement context (with its graph and layout) shared by the tests of the module"""
+    K = FormalContext.read_json('data/animal_movement.json')
+    L = ConceptLattice.from_context(K)
+    G = L.to_networkx()
+    return SimpleNamespace(
+        K=K, L=L, G=G, pos=line_layouts.fcart_layout(L), nodes=tuple(G.nodes), edges=tuple(G.edges))
+
+
+@pytest.fixture(scope='module')
+def liveinwater_lattice():
+    """The lattice of liveinwater context (with its layout) shared by the tests of the module"""
+    K = FormalContext.read_cxt('data/liveinwater.cxt')
+    L = ConceptLattice.from_context(K)
+    return SimpleNamespace(K=K, L=L, pos=line_layouts.fcart_layout(L))
+
+
+@pytest.fixture(scope='module')
+def shared_fig_ax():
+    """The figure (on white background) to draw on, shared by the tests of the module"""
+    with plt.rc_context({'figure.facecolor': (1, 1, 1, 1)}):
+        fig, ax = plt.subplots(figsize=(7, 5), dpi=COMPARE_DPI)
+    yield fig, ax
+    plt.close(fig)
+
+
+@pytest.fixture
+def fig_ax(shared_fig_ax):
+    """The shared figure with its axes cleared from the drawings of the previous test"""
+    fig, ax = shared_fig_ax
+    ax.clear()
+    return fig, ax
+
+
 def test__init__abstract():
     vsl = viz.AbstractLineViz()
 
@@ -26,15 +94,13 @@ def test__init__abstract():
         vsl.draw_concept_lattice(None)
 
 
-def test_filter_nodes_edges():
-    path = 'data/animal_movement.json'
-    K = FormalContext.read_json(path)
-    L = ConceptLattice.from_context(K)
-    G = L.to_networkx()
+def test_filter_nodes_edges(animal_movement_lattice):
+    G = animal_movement_lattice.G
 
-    nodes_all, edges_all = list(G.nodes), list(G.edges)
+    nodes_all, edges_all = list(animal_movement_lattice.nodes), list(animal_movement_lattice.edges)
     nodes_filter = [0, 1, 3, 4, 5]
     edges_filter = [(0,1), (0,2), (1,4), (2,4)]
+    nodes_filter_set = frozenset(nodes_filter)
 
     vsl = viz.AbstractLineViz()
     nodes, edges = vsl._filter_nodes_edges(G)
@@ -43,7 +109,7 @@ def test_filter_nodes_edges():
 
     nodes, edges = vsl._filter_nodes_edges(G, nodelist=nodes_filter)
     assert nodes == nodes_filter
-    assert edges == [e for e in edges_all if e[0] in nodes_filter and e[1] in nodes_filter]
+    assert edges == [e for e in edges_all if e[0] in nodes_filter_set and e[1] in nodes_filter_set]
 
     nodes, edges = vsl._filter_nodes_edges(G, edgelist=edges_filter)
     assert nodes == nodes_all
@@ -51,13 +117,11 @@ def test_filter_nodes_edges():
 
     nodes, edges = vsl._filter_nodes_edges(G, nodelist=nodes_filter, edgelist=edges_filter)
     assert nodes == nodes_filter
-    assert edges == [e for e in edges_filter if e[0] in nodes_filter and e[1] in nodes_filter]
+    assert edges == [e for e in edges_filter if e[0] in nodes_filter_set and e[1] in nodes_filter_set]
 
 
-def test_concept_lattice_label_func():
-    path = 'data/animal_movement.json'
-    K = FormalContext.read_json(path)
-    L = ConceptLattice.from_context(K)
+def test_concept_lattice_label_func(animal_movement_lattice):
+    L = animal_movement_lattice.L
     vsl = viz.AbstractLineViz()
 
     lbl = vsl.concept_lattice_label_func(0, L)
@@ -66,78 +130,69 @@ def test_concept_lattice_label_func():
     lbl = vsl.concept_lattice_label_func(2, L, max_new_extent_count=3)
     assert lbl == '1: run\n\n3: dog, horse, zebra'
 
+    lbl = vsl.concept_lattice_label_func(3, L, max_new_intent_count=None, max_new_extent_count=None)
+    assert lbl == '1: fly\n\n1: dove'
 
-def test_draw_concept_lattice_networkx():
-    def compare_figure_png(fig, fname):
-        with io.BytesIO() as buff:
-            fig.savefig(buff, format='png', dpi=300)
-            buff.seek(0)
-            im_fig = plt.imread(buff)
-
-        im_file = image.imread(fname)
-        assert ((im_fig-im_file) < 1e-2).all(), f"Cannot recreate the figure from file {fname}"
-        # TODO Make the assertion more strict
+    lbl = vsl.concept_lattice_label_func(2, L, max_new_extent_count=None)
+    assert lbl == '1: run\n\n3: dog, horse, zebra'
 
-    # The simplest case
-    path = 'data/animal_movement.json'
-    K = FormalContext.read_json(path)
-    L = ConceptLattice.from_context(K)
 
-    plt.rcParams['figure.facecolor'] = (1, 1, 1, 1)
-    fig, ax = plt.subplots(figsize=(7, 5))
+@pytest.mark.parametrize('case', ['simple', 'overloaded'])
+def test_draw_concept_lattice_networkx(animal_movement_lattice, fig_ax, case):
+    L = animal_movement_lattice.L
     vsl = viz.LineVizNx()
-    vsl.draw_concept_lattice(
-        L, ax=ax, flg_node_indices=False, flg_axes=False
-    )
+    G = vsl._get_networkx_graph(L)
+
+    fig, ax = fig_ax
+    if case == 'simple':
+        vsl.draw_concept_lattice(L, ax=ax, flg_node_indices=False, flg_axes=False)
+    else:  # Specify optional parameters. The nodes and edges are read from the graph the visualizer draws
+        vsl.draw_concept_lattice(
+            L, ax=ax, flg_node_indices=True, flg_axes=True, pos=animal_movement_lattice.pos,
+            nodelist=list(G.nodes), edgelist=list(G.edges)
+        )
     ax.set_xlim(-0.6, 0.65)
     ax.set_ylim(-0.6, 1.1)
     fig.tight_layout()
 
-    compare_figure_png(fig, 'data/animal_movement_lattice.png')
+    fname = {'simple': 'data/animal_movement_lattice.png',
+             'overloaded': 'data/animal_movement_lattice_overloaded.png'}[case]
+    assert is_image_close(fig_to_rgba(fig), load_reference_rgba(fname)),\
+        f"Cannot recreate the figure from file {fname}"
 
-    # Specify optional parameters
-    pos = line_layouts.fcart_layout(L)
-    G = L.to_networkx()
-    nodelist = list(G.nodes)
-    edgelist = list(G.edges)
-
-    fig, ax = plt.subplots(figsize=(7, 5))
-    vsl.draw_concept_lattice(
-        L, ax=ax, flg_node_indices=True, flg_axes=True,
-        pos=pos, nodelist=nodelist, edgelist=edgelist
-    )
-    ax.set_ylim(-0.6, 1.1)
-    ax.set_xlim(-0.6, 0.65)
-    fig.tight_layout()
+    assert vsl._get_networkx_graph(L) is G, 'The graph of the lattice should be built once per drawn lattice'
 
-    compare_figure_png(fig, 'data/animal_movement_lattice_overloaded.png')
 
+def test_draw_concept_lattice_geometry(animal_movement_lattice, fig_ax):
+    """Check the drawn artists against the lattice without rendering the figure"""
+    L, pos = animal_movement_lattice.L, animal_movement_lattice.pos
+    nodelist = [c_i for c_i in animal_movement_lattice.nodes if c_i != L.bottom]
+    n_edges = sum(1 for e in animal_movement_lattice.edges if L.bottom not in e)
 
-def test_flg_drop_empty_bottom():
-    path = 'data/liveinwater.cxt'
-    K = FormalContext.read_cxt(path)
-    L = ConceptLattice.from_context(K)
+    fig, ax = fig_ax
+    viz.LineVizNx().draw_concept_lattice(L, ax=ax, pos=pos, nodelist=nodelist, flg_node_indices=False)
+    nodes_offsets = np.concatenate([collection.get_offsets() for collection in ax.collections])
+    assert sorted(map(tuple, nodes_offsets)) == sorted(tuple(pos[c_i]) for c_i in nodelist)
+    assert len(ax.patches) == n_edges
+    assert len(ax.texts) == len(nodelist)
 
-    def lattice_to_img(L, nodelist, flg_drop_empty_bottom):
-        plt.rcParams['figure.facecolor'] = (1, 1, 1, 1)
 
-        fig, ax = plt.subplots(figsize=(7, 5))
+def test_flg_drop_empty_bottom(liveinwater_lattice, fig_ax):
+    L, pos = liveinwater_lattice.L, liveinwater_lattice.pos
+    fig, ax = fig_ax
+
+    def lattice_to_img(L, nodelist, flg_drop_empty_bottom):
+        ax.clear()
         vsl = viz.LineVizNx()
         vsl.draw_concept_lattice(
             L, ax=ax, flg_node_indices=False, flg_axes=False,
-            nodelist=nodelist, flg_drop_empty_bottom = flg_drop_empty_bottom
+            nodelist=nodelist, flg_drop_empty_bottom = flg_drop_empty_bottom, pos=pos
         )
-
-        with io.BytesIO() as buff:
-            fig.savefig(buff, format='png', dpi=300)
-            buff.seek(0)
-            img = plt.imread(buff)
-
-        return img
+        return fig_to_rgba(fig).copy()
 
     img0 = lattice_to_img(L, [c_i for c_i in range(len(L)) if c_i != L.bottom], False)
     img1 = lattice_to_img(L, None, True)
-    assert (img0 == img1).all()
+    assert np.array_equal(img0, img1), "Dropping the empty bottom concept should be the same as not drawing it"
 
 
 def test_parse_node_varying_parameter():
@@ -160,10 +215,8 @@ def test_parse_node_varying_parameter():
         vsl._parse_node_varying_parameter(['yellow'] * 5, 'DefaultValue', [0, 1, 2], len(G), 'ParamType')
 
 
-def test_init_mover():
-    path = 'data/liveinwater.cxt'
-    K = FormalContext.read_cxt(path)
-    L = ConceptLattice.from_context(K)
+def test_init_mover(liveinwater_lattice):
+    L = liveinwater_lattice.L
 
     vsl = viz.LineVizNx()
     vsl.init_mover_per_poset(L)
@@ -173,3 +226,55 @@ def test_init_mover():
     mvr.initialize_pos(L)
     pos_true = mvr.pos
     assert pos == pos_true
+
+
+def test_get_networkx_graph(liveinwater_lattice):
+    K, L = liveinwater_lattice.K, liveinwater_lattice.L
+
+    vsl = viz.LineVizNx()
+    G = vsl._get_networkx_graph(L)
+    assert set(G.edges) == set(L.to_networkx('down').edges)
+    assert vsl._get_networkx_graph(L) is G, 'LineVizNx._get_networkx_graph failed. The graph should be reused'
+
+    L_small = ConceptLattice.from_context(K[:3])
+    assert set(vsl._get_networkx_graph(L_small).edges) == set(L_small.to_networkx('down').edges),\
+        'LineVizNx._get_networkx_graph failed. The graph of a new poset should be rebuilt'
+
+    poset = POSet(list(L), use_cache=False)
+    G_poset = vsl._get_networkx_graph(poset)
+    assert set(G_poset.edges) == set(L.to_networkx('down').edges)
+    assert vsl._get_networkx_graph(poset) is G_poset,\
+        'LineVizNx._get_networkx_graph failed. The graph of a poset without cache should be reused too'
+
+    version = poset.version
+    poset.remove(L[L.bottom])
+    assert poset.version > version, 'POSet.remove failed. The version of the poset should be increased'
+    assert len(vsl._get_networkx_graph(poset)) == len(L) - 1,\
+        'LineVizNx._get_networkx_graph failed. The graph of a changed poset should be rebuilt'
+
+
+def test_draw_quiver(liveinwater_lattice, fig_ax):
+    L = liveinwater_lattice.L
+
+    edges = [(child_i, parent_i, label) for parent_i, children in L.children_dict.items() for child_i in children
+             for label in ['a', 'b', 'c'][:1 + (parent_i + child_i) % 3]]
+    edge_colors = ['red', 'green', 'blue'] * (len(edges) // 3) + ['red'] * (len(edges) % 3)
+
+    fig, ax = fig_ax
+    vsl = viz.LineVizNx()
+    G, pos, nodelist, edgelist = vsl.draw_quiver(L, edges, ax=ax, edge_color=edge_colors)
+    assert set(edgelist) == {(parent_i, child_i) for child_i, parent_i, _ in edges}
+    assert len(ax.patches) == len(edges), 'LineVizNx.draw_quiver failed. Every labeled edge should be drawn'
+
+
+def test_is_image_close():
+    im = np.zeros((300, 20, 4), dtype=np.uint8)
+    assert is_image_close(im, im.copy())
+    assert not is_image_close(im, im[:-1])
+
+    im_other = im.copy()
+    im_other[-1, -1, 0] = 2
+    assert is_image_close(im, im_other)
+    im_other[-1, -1, 0] = 3
+    assert not is_image_close(im, im_other)
+    assert not is_image_close(im_other, im), 'The comparison should be symmetric'